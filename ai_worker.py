@@ -0,0 +1,126 @@
+"""
+Runs the cat's decision off the render thread.
+
+The search is CPU-bound pure Python, so while it runs on the main loop the
+window stops repainting. AIWorker plans the turn on a snapshot of the game
+in a background thread or process and the main loop polls for the result
+once per frame, animating the idle cat in the meantime.
+"""
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import functools
+
+import engine
+import hint
+from transposition import TranspositionTable
+
+WORKER_MODES = ("thread", "process")
+
+# The worker process keeps one transposition table for its whole life.
+# Entries only depend on the position, so they stay valid across turns and games.
+process_table = None
+
+
+def init_process(settings):
+    global process_table
+    for name, value in settings.items():
+        setattr(engine, name, value)
+    process_table = TranspositionTable(engine.TRANSPOSITION_TABLE_SIZE)
+
+
+# COLLECT_STATS travels with every job so the debug overlay can be toggled while playing
+def plan(state, collect_stats=False):
+    engine.COLLECT_STATS = collect_stats
+    decision = engine.plan_cat_turn(state)
+    return decision, state.last_search, state.last_stats
+
+
+def plan_in_process(state, collect_stats=False):
+    state.transpositions = process_table # The pickled snapshot arrives without one
+    return plan(state, collect_stats)
+
+
+# The player's block suggestion, ranked on the same transposition table as the cat's search
+def rank_blocks_in_process(state):
+    state.transpositions = process_table
+    return hint.rank_blocks(state)
+
+
+class AIWorker:
+    """
+    Plans one cat turn at a time in the background.
+    submit() hands over a snapshot, poll() returns (CatDecision, SearchInfo,
+    TurnStats or None) once it is ready and cancel() drops a turn whose result is no longer
+    wanted (e.g. on Restart). A cancelled search is not interrupted, but
+    it is bounded by the engine's time budget and its result is discarded.
+    An instrumentation.Profiler (thread mode only) records every search.
+    submit_hint() and poll_hint() do the same for the player's block
+    suggestion (hint.py), which runs while the player is thinking and is
+    dropped when the cat's next turn is submitted.
+    """
+
+    def __init__(self, mode="thread", profiler=None):
+        if mode not in WORKER_MODES:
+            raise ValueError(f"Unknown worker mode {mode!r}, expected one of {WORKER_MODES}")
+        if profiler is not None and mode != "thread":
+            raise ValueError("Profiling is only supported in thread mode")
+        self.mode = mode
+        if mode == "process":
+            settings = {name: getattr(engine, name) for name in engine.ENGINE_SETTINGS}
+            self.executor = ProcessPoolExecutor(max_workers=1, initializer=init_process, initargs=(settings,))
+            self.job = plan_in_process
+            self.hint_job = rank_blocks_in_process
+        else:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cat-ai")
+            self.job = functools.partial(profiler.runcall, plan) if profiler else plan
+            self.hint_job = hint.rank_blocks
+        self.future = None
+        self.hint_future = None
+
+    @property
+    def busy(self):
+        return self.future is not None
+
+    def submit(self, state):
+        """Starts planning the cat's turn for the current state."""
+        self.cancel()
+        self.cancel_hint() # Its position is gone; one still running only delays the cat by its budget
+        self.future = self.executor.submit(self.job, state.copy(), engine.COLLECT_STATS)
+
+    def poll(self):
+        """Returns (CatDecision, SearchInfo, TurnStats) when the search has finished, else None."""
+        if self.future is None or not self.future.done():
+            return None
+        future, self.future = self.future, None
+        return future.result() # Re-raises anything the search raised
+
+    def cancel(self):
+        if self.future is not None:
+            self.future.cancel() # Only stops it if it has not started yet
+            self.future = None
+
+    # --- Block Suggestions ---
+    @property
+    def hint_busy(self):
+        return self.hint_future is not None
+
+    def submit_hint(self, state):
+        """Starts ranking the player's blocks for the current state."""
+        self.cancel_hint()
+        self.hint_future = self.executor.submit(self.hint_job, state.copy())
+
+    def poll_hint(self):
+        """Returns the hint.BlockHint when the ranking has finished, else None."""
+        if self.hint_future is None or not self.hint_future.done():
+            return None
+        future, self.hint_future = self.hint_future, None
+        return future.result()
+
+    def cancel_hint(self):
+        if self.hint_future is not None:
+            self.hint_future.cancel()
+            self.hint_future = None
+
+    def shutdown(self):
+        self.cancel()
+        self.cancel_hint()
+        self.executor.shutdown(wait=False, cancel_futures=True)
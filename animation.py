@@ -0,0 +1,124 @@
+"""
+Time-based, non-blocking animations.
+
+An Animation is a list of frame durations plus callbacks: on_start when it
+begins (e.g. play a sound), draw while it runs and on_finish when it ends
+(e.g. apply the move it showed). The AnimationScheduler plays them one
+after another and is advanced from the main loop with the milliseconds
+returned by clock.tick(), so input and repainting keep working while the
+cat runs. Nothing in here imports pygame; with headless=True every
+animation finishes the moment it is played and costs nothing.
+"""
+from collections import deque
+import math
+
+
+class Animation:
+    def __init__(self, frames, draw=None, on_start=None, on_finish=None, rect=None, hides_cat=True):
+        self.frames = list(frames) # Duration of each frame in ms
+        self.duration = sum(self.frames)
+        self.draw_callback = draw  # Called with the animation while it is playing
+        self.on_start = on_start
+        self.on_finish = on_finish
+        self.rect = rect           # Screen area the animation paints, for dirty-rect updates
+        self.hides_cat = hides_cat # The animation draws the cat itself
+        self.elapsed = 0.0
+        self.finished = False
+
+    @property
+    def frame(self):
+        """Index of the frame showing at the current time."""
+        t = self.elapsed
+        for i, length in enumerate(self.frames):
+            if t < length:
+                return i
+            t -= length
+        return max(len(self.frames) - 1, 0)
+
+    @property
+    def progress(self):
+        """0.0 at the start, 1.0 at the end."""
+        return min(self.elapsed / self.duration, 1.0) if self.duration else 1.0
+
+    def start(self):
+        if self.on_start:
+            self.on_start()
+
+    def advance(self, ms):
+        """Moves time forward. Returns the milliseconds left over once the animation has ended."""
+        self.elapsed += ms
+        if self.elapsed >= self.duration:
+            leftover = self.elapsed - self.duration
+            self.elapsed = self.duration
+            self.finished = True
+            return leftover
+        return 0.0
+
+    def finish(self):
+        if self.on_finish:
+            self.on_finish()
+
+    def draw(self):
+        if self.draw_callback:
+            self.draw_callback(self)
+
+
+class AnimationScheduler:
+    """
+    Plays queued animations in order. update() is called once per frame
+    with the elapsed milliseconds; speed scales them and skip() jumps to
+    the end of everything that is queued. on_finish callbacks may queue
+    further animations, which then play next.
+    """
+
+    def __init__(self, speed=1.0, headless=False):
+        self.speed = speed
+        self.headless = headless
+        self.queue = deque()
+        self.current = None
+        self.updating = False
+
+    @property
+    def busy(self):
+        return self.current is not None or bool(self.queue)
+
+    @property
+    def hides_cat(self):
+        return self.current is not None and self.current.hides_cat
+
+    def play(self, animation):
+        self.queue.append(animation)
+        self.update(0) # Starts it right away if nothing else is playing
+
+    def update(self, dt_ms):
+        if self.updating:
+            return # Called from a callback; the running loop picks the new animation up
+        self.updating = True
+        try:
+            remaining = math.inf if self.headless else dt_ms * self.speed
+            while True:
+                if self.current is None:
+                    if not self.queue:
+                        break
+                    self.current = self.queue.popleft()
+                    self.current.start()
+                remaining = self.current.advance(remaining)
+                if not self.current.finished:
+                    break
+                done, self.current = self.current, None
+                done.finish()
+        finally:
+            self.updating = False
+
+    def skip(self):
+        """Finishes every queued animation now, running all their callbacks."""
+        self.update(math.inf)
+
+    def clear(self):
+        """Drops every animation without running its callbacks (e.g. on Restart)."""
+        self.queue.clear()
+        self.current = None
+
+    def draw(self):
+        if self.current is not None:
+            self.current.draw()
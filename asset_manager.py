@@ -0,0 +1,162 @@
+"""
+Lazy, cached asset loading for game.py.
+
+Nothing is read from disk until it is first drawn or played: the dead and
+attack sprites, the game over pictures and the sounds are not needed for
+the first frame, so startup does not wait for them. Every image is cached
+per (path, size, flip), and a flipped variant is made from the cached
+unflipped one, so each PNG is decoded and scaled once per session.
+
+The optional sprite atlas is a file with every variant the game has used,
+already scaled, as raw RGBA pixels. The next start reads them from there
+instead of decoding and scaling the PNGs (the 1024x1024 logo alone takes
+about 30 ms to decode, only to be shown at 50x50). An entry is used while
+its PNG's modification time still matches; everything loaded from a PNG
+instead is added when the atlas is saved at exit.
+"""
+import json
+import os
+import struct
+
+import pygame
+
+ATLAS_MAGIC = b"TTCA"
+ATLAS_VERSION = 1
+ATLAS_HEADER = struct.Struct("<4sBI") # magic, version, length of the JSON index; the pixels follow it
+
+
+class AssetManager:
+    """Images, sprite series and sounds, each loaded on first use and then kept."""
+
+    def __init__(self, atlas_path=None):
+        self.atlas_path = atlas_path # None: always decode the PNGs
+        self.images = {}       # (path, size, flip) -> Surface
+        self.series_lists = {} # (folder, count, size, flip) -> [Surface]
+        self.sounds = {}       # path -> Sound, or None if the file is missing
+        self.atlas = None      # (path, size, flip) -> (mtime, offset, width, height), read on first use
+        self.atlas_data = b""
+        self.decoded = 0       # Images decoded from PNGs
+        self.from_atlas = 0    # Images read from the atlas
+
+    # --- Images ---
+    def image(self, path, size=None, flip=False, alpha=True):
+        """The image at path, scaled to size (width, height) and mirrored left to right if flip."""
+        key = (path, size, flip)
+        img = self.images.get(key)
+        if img is None:
+            if flip:
+                img = pygame.transform.flip(self.image(path, size, False, alpha), True, False)
+            else:
+                img = self.load_from_atlas(key, alpha)
+                if img is None:
+                    img = pygame.image.load(path)
+                    img = img.convert_alpha() if alpha else img.convert()
+                    if size:
+                        img = pygame.transform.scale(img, size)
+                    self.decoded += 1
+            self.images[key] = img
+        return img
+
+    def series(self, folder, count, size, flip=False):
+        """
+        Frames folder/<name>1.png to folder/<name><count>.png, where name is
+        the folder's own name. Missing frames are left out; a missing folder
+        gives an empty list.
+        """
+        key = (folder, count, size, flip)
+        images = self.series_lists.get(key)
+        if images is None:
+            images = []
+            if not os.path.exists(folder):
+                print(f"Warning: Sprite folder not found at {folder}")
+            else:
+                name = os.path.basename(folder)
+                for i in range(1, count + 1):
+                    path = os.path.join(folder, f"{name}{i}.png")
+                    if os.path.exists(path):
+                        images.append(self.image(path, size, flip))
+            self.series_lists[key] = images
+        return images
+
+    # --- Sounds ---
+    def sound(self, path):
+        """The Sound at path, or None if there is no such file."""
+        if path not in self.sounds:
+            self.sounds[path] = pygame.mixer.Sound(path) if os.path.exists(path) else None
+        return self.sounds[path]
+
+    # --- Atlas ---
+    def read_atlas(self):
+        self.atlas = {}
+        if not self.atlas_path or not os.path.exists(self.atlas_path):
+            return
+        with open(self.atlas_path, "rb") as f:
+            data = f.read()
+        magic, version, index_size = ATLAS_HEADER.unpack_from(data)
+        if magic != ATLAS_MAGIC or version != ATLAS_VERSION:
+            return # Written by another version: rebuilt at exit
+        start = ATLAS_HEADER.size + index_size
+        for path, size, flip, mtime, offset, width, height in json.loads(data[ATLAS_HEADER.size:start]):
+            key = (path, tuple(size) if size else None, flip)
+            self.atlas[key] = (mtime, start + offset, width, height)
+        self.atlas_data = memoryview(data)
+
+    def atlas_entry(self, key):
+        """The atlas entry of key if its PNG has not changed since, else None."""
+        if self.atlas is None:
+            self.read_atlas()
+        entry = self.atlas.get(key)
+        if entry is None:
+            return None
+        try:
+            mtime = os.stat(key[0]).st_mtime_ns
+        except OSError:
+            return None
+        return entry if entry[0] == mtime else None
+
+    def load_from_atlas(self, key, alpha):
+        entry = self.atlas_entry(key)
+        if entry is None:
+            return None
+        _, offset, width, height = entry
+        pixels = self.atlas_data[offset:offset + width * height * 4]
+        img = pygame.image.frombuffer(pixels, (width, height), "RGBA")
+        self.from_atlas += 1
+        return img.convert_alpha() if alpha else img.convert() # Copies out of the atlas buffer
+
+    def save_atlas(self):
+        """Writes every unflipped image loaded so far, plus the atlas entries still valid, to atlas_path."""
+        if not self.atlas_path or not self.decoded:
+            return # Nothing new since the atlas was read
+        if self.atlas is None:
+            self.read_atlas()
+        index = []
+        chunks = []
+        offset = 0
+        keys = [key for key in self.images if not key[2]]
+        keys += [key for key in self.atlas if key not in self.images and self.atlas_entry(key)]
+        for key in keys:
+            path, size, flip = key
+            if key in self.images:
+                img = self.images[key]
+                pixels = pygame.image.tobytes(img, "RGBA")
+                width, height = img.get_size()
+            else:
+                _, start, width, height = self.atlas[key]
+                pixels = self.atlas_data[start:start + width * height * 4]
+            index.append([path, size, flip, os.stat(path).st_mtime_ns, offset, width, height])
+            chunks.append(pixels)
+            offset += len(pixels)
+
+        header = json.dumps(index).encode()
+        os.makedirs(os.path.dirname(self.atlas_path) or ".", exist_ok=True)
+        temp = self.atlas_path + ".tmp"
+        with open(temp, "wb") as f:
+            f.write(ATLAS_HEADER.pack(ATLAS_MAGIC, ATLAS_VERSION, len(header)))
+            f.write(header)
+            for pixels in chunks:
+                f.write(pixels)
+        os.replace(temp, self.atlas_path) # A half-written atlas is never read
+
+    def summary(self):
+        return f"{self.decoded} images decoded, {self.from_atlas} from the atlas, {len(self.sounds)} sounds"
@@ -0,0 +1,179 @@
+"""
+Batch evaluation with NumPy: evaluate_board() for many boards at once.
+
+Self-play, tuning and tablebase work evaluate thousands of positions, and
+one evaluate_board() call per position (an A* each) is slow in Python.
+Here the boards are stacked into one array, N x size x size blocked
+masks, and all of them are searched at once: a breadth-first wavefront
+from the open edge cells, where every iteration advances the front of
+every board by one step with a few whole-array operations.
+
+Each board is packed into one 64-bit word per row (boards up to 64
+columns), so a step is a handful of shifts and ORs over N x size words:
+left and right are bit shifts, up and down are the neighbouring rows.
+A board leaves the batch as soon as it is done, so a few long mazes do
+not keep every board in the loop.
+
+edge_distances() gives the same fields as distance_field.EdgeDistanceField
+(UNREACHABLE for blocked and cut-off cells). evaluate_boards() gives
+exactly evaluate_board()'s scores: +1000 with the cat on the edge, -1000
+with no way out, else minus the tiles on the shortest path, start
+included. It stops a board once the front touches the cat, the way A*
+stops at the first edge tile, and never builds the fields.
+"""
+import numpy as np
+
+from board import grid_for
+from distance_field import UNREACHABLE
+
+ONE = np.uint64(1)
+MAX_SIZE = 64 # Columns that fit a packed row
+
+wave_tables = {} # (size, topology) -> (row mask, odd rows, packed edge cells)
+
+
+# --- Packing ---
+def stack_boards(boards):
+    """Board objects (all of one size) as an N x size x size bool array of blocked masks."""
+    size = boards[0].grid.size
+    data = b"".join(bytes(board.cells) for board in boards)
+    return np.frombuffer(data, dtype=np.uint8).reshape(len(boards), size, size).astype(bool)
+
+
+def pack_rows(cells):
+    """N x size x size bool array -> N x size uint64 array, bit c of a row set for column c."""
+    n, size, _ = cells.shape
+    packed = np.zeros((n, size, 8), dtype=np.uint8)
+    packed[:, :, :(size + 7) // 8] = np.packbits(cells, axis=2, bitorder="little")
+    return packed.view("<u8")[:, :, 0]
+
+
+def unpack_rows(rows, size):
+    """The inverse of pack_rows(), as uint8 0/1 values."""
+    bits = np.unpackbits(rows.astype("<u8").view(np.uint8), axis=-1, bitorder="little")
+    return bits.reshape(rows.shape + (64,))[..., :size]
+
+
+def tables_for(grid):
+    key = (grid.size, grid.topology)
+    tables = wave_tables.get(key)
+    if tables is None:
+        if grid.size > MAX_SIZE:
+            raise ValueError(f"Boards up to {MAX_SIZE} columns fit a packed row, got {grid.size}")
+        row_mask = np.uint64((1 << grid.size) - 1)
+        odd_rows = (np.arange(grid.size) & 1 == 1)[None, :]
+        edge = np.frombuffer(grid.is_edge, dtype=np.uint8).reshape(1, grid.size, grid.size).astype(bool)
+        tables = wave_tables[key] = (row_mask, odd_rows, pack_rows(edge))
+    return tables
+
+
+# --- Wavefront ---
+def reach(front, grid):
+    """
+    Cells with a neighbour in front, for N x size packed rows. On hex
+    boards a cell also reaches one column further into the rows above and
+    below: to the left from even rows, to the right from odd ones.
+    """
+    row_mask, odd_rows, _ = tables_for(grid)
+    vertical = np.zeros_like(front)
+    vertical[:, 1:] = front[:, :-1]
+    vertical[:, :-1] |= front[:, 1:]
+    reached = vertical | (((front << ONE) | (front >> ONE)) & row_mask)
+    if grid.hex:
+        reached |= np.where(odd_rows, vertical >> ONE, (vertical << ONE) & row_mask)
+    return reached
+
+
+def edge_distances(blocked, topology="square"):
+    """
+    Distance to the edge for every cell of every board in blocked, an
+    N x size x size bool array, as an int32 array of the same shape.
+    Blocked cells and cells with no way out are UNREACHABLE.
+    The distances are counted in bit planes: every step adds one, with a
+    carry, to the cells the front has not reached yet, so they are only
+    unpacked once at the end.
+    """
+    blocked = np.asarray(blocked, dtype=bool)
+    n, size, _ = blocked.shape
+    grid = grid_for(size, topology)
+    row_mask, _, edge = tables_for(grid)
+
+    open_cells = ~pack_rows(blocked) & row_mask
+    front = open_cells & edge
+    unvisited = open_cells & ~front
+    planes = np.zeros((grid.cells.bit_length(), n, size), dtype=np.uint64) # Bit p of every distance
+    unreached = np.zeros((n, size), dtype=np.uint64) # Open cells with no way out, filled in as boards finish
+    steps = 0
+
+    active = np.arange(n) # Boards still in the loop, by their index in blocked
+    counts = planes       # Bit planes of the active boards
+    while len(active):
+        front = reach(front, grid) & unvisited
+        steps += 1
+        # Every cell still unvisited before this step is one step further away
+        carry = unvisited
+        for plane in counts:
+            overflow = plane & carry
+            plane ^= carry
+            carry = overflow
+            if not carry.any():
+                break
+        unvisited &= ~front
+
+        done = ~front.any(axis=1)
+        if done.any():
+            finished = active[done]
+            planes[:, finished] = counts[:, done]
+            unreached[finished] = unvisited[done]
+            keep = ~done
+            active, front, unvisited, counts = active[keep], front[keep], unvisited[keep], counts[:, keep]
+
+    dist = np.zeros((n, size, size), dtype=np.int32)
+    for p in range(steps.bit_length()):
+        dist |= unpack_rows(planes[p], size).astype(np.int32) << p
+    # Unreached cells were counted on every step; they and the blocked cells are UNREACHABLE
+    dist[blocked | unpack_rows(unreached, size).astype(bool)] = UNREACHABLE
+    return dist
+
+
+# --- Scores ---
+def evaluate_boards(blocked, cats, topology="square"):
+    """
+    evaluate_board() for N positions at once. blocked is an
+    N x size x size bool array, cats an N x 2 array of (row, col).
+    Returns (scores, trapped): int32 scores and bool flags, True where
+    the cat has no way out.
+    The cat's distance is one more than its nearest open neighbour's,
+    the way A* leaves the cat's own tile, so a board is done when the
+    front first touches a neighbour of the cat (or dies out).
+    """
+    blocked = np.asarray(blocked, dtype=bool)
+    n, size, _ = blocked.shape
+    grid = grid_for(size, topology)
+    row_mask, _, edge = tables_for(grid)
+
+    cats = np.asarray(cats, dtype=np.intp).reshape(n, 2)
+    cat_cells = np.zeros((n, size), dtype=np.uint64)
+    cat_cells[np.arange(n), cats[:, 0]] = ONE << cats[:, 1].astype(np.uint64)
+    scores = np.full(n, -1000, dtype=np.int32)
+    on_edge = (cat_cells & edge).any(axis=1)
+    scores[on_edge] = 1000
+
+    open_cells = ~pack_rows(blocked) & row_mask
+    front = open_cells & edge
+    unvisited = open_cells & ~front
+    around = reach(cat_cells, grid) # The cat's neighbours
+
+    active = np.flatnonzero(~on_edge)
+    front, unvisited, around = front[active], unvisited[active], around[active]
+    d = 0
+    while len(active):
+        found = (front & around).any(axis=1)
+        scores[active[found]] = -(d + 2) # The neighbour, d steps to the edge, and the cat itself
+        keep = ~found & front.any(axis=1)
+        if not keep.all():
+            active, front, unvisited, around = active[keep], front[keep], unvisited[keep], around[keep]
+        front = reach(front, grid) & unvisited
+        unvisited &= ~front
+        d += 1
+    return scores, scores == -1000
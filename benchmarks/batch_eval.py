@@ -0,0 +1,95 @@
+"""
+Batch evaluation: evaluate_board() in a loop vs. batch_eval.py.
+
+Generates seeded positions (a random cat, anything from an empty board to
+two thirds blocked) and scores them one by one with evaluate_board() and
+with the NumPy wavefront, in batches of --batch positions. Then the same
+for whole edge-distance fields: an EdgeDistanceField per board against
+edge_distances(). Every score, trapped flag and distance must agree.
+
+Run from the repository root:
+    python -m benchmarks.batch_eval [--positions 20000] [--batch 5000] [--size 11 21] [--topology square hex]
+"""
+import argparse
+import random
+import time
+
+import engine
+from batch_eval import edge_distances, evaluate_boards, stack_boards
+from board import TOPOLOGIES, Board, grid_for
+from distance_field import EdgeDistanceField
+
+
+def make_positions(count, grid, seed=1):
+    rng = random.Random(seed)
+    positions = []
+    for _ in range(count):
+        cat = rng.randrange(grid.cells)
+        board = Board(grid)
+        target = rng.randrange(grid.cells * 2 // 3)
+        while board.count < target:
+            i = rng.randrange(grid.cells)
+            if i != cat and not board.cells[i]:
+                board.block(i)
+        positions.append((cat, board))
+    return positions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--positions", type=int, default=20000)
+    parser.add_argument("--batch", type=int, default=5000)
+    parser.add_argument("--size", type=int, nargs="+", default=[11, 21])
+    parser.add_argument("--topology", choices=TOPOLOGIES, nargs="+", default=list(TOPOLOGIES))
+    args = parser.parse_args()
+
+    for size in args.size:
+        for topology in args.topology:
+            grid = grid_for(size, topology)
+            positions = make_positions(args.positions, grid)
+
+            boards = [board for _, board in positions]
+            cats = [grid.cell(cat) for cat, _ in positions]
+
+            start = time.perf_counter()
+            scalar = [engine.evaluate_board(cat, board) for cat, board in positions]
+            scalar_time = time.perf_counter() - start
+
+            # Stacking the Board objects into arrays is part of the batch cost
+            scores = []
+            trapped = []
+            start = time.perf_counter()
+            for first in range(0, len(positions), args.batch):
+                chunk_scores, chunk_trapped = evaluate_boards(
+                    stack_boards(boards[first:first + args.batch]), cats[first:first + args.batch], topology)
+                scores += chunk_scores.tolist()
+                trapped += chunk_trapped.tolist()
+            batch_time = time.perf_counter() - start
+
+            if scores != scalar or trapped != [score == -1000 for score in scalar]:
+                raise SystemExit(f"Mismatch: evaluate_boards() disagrees with evaluate_board() on {size} {topology}")
+
+            # Whole fields: one EdgeDistanceField BFS per board vs. edge_distances()
+            start = time.perf_counter()
+            fields = [EdgeDistanceField(board).dist for board in boards]
+            field_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            batch_fields = [edge_distances(stack_boards(boards[first:first + args.batch]), topology)
+                            for first in range(0, len(positions), args.batch)]
+            batch_field_time = time.perf_counter() - start
+
+            if [row for chunk in batch_fields for row in chunk.reshape(-1, grid.cells).tolist()] != fields:
+                raise SystemExit(f"Mismatch: edge_distances() disagrees with EdgeDistanceField on {size} {topology}")
+
+            count = len(positions)
+            print(f"{size}x{size} {topology}, {count} positions, batches of {args.batch}")
+            print(f"  evaluate_board() loop     {count / scalar_time:12,.0f} positions/s")
+            print(f"  evaluate_boards()         {count / batch_time:12,.0f} positions/s  ({scalar_time / batch_time:.1f}x)")
+            print(f"  EdgeDistanceField loop    {count / field_time:12,.0f} fields/s")
+            print(f"  edge_distances()          {count / batch_field_time:12,.0f} fields/s  "
+                  f"({field_time / batch_field_time:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
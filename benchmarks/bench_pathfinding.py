@@ -0,0 +1,40 @@
+"""A* to the edge and to a goal, evaluate_board() and the trap min-cut, over the corpus."""
+import pytest
+
+import engine
+from benchmarks.corpus import KINDS
+from trap_cut import min_cut
+
+
+def astar_to_edge(positions):
+    for p in positions:
+        engine.a_star_search(p.cat, p.board)
+
+def astar_to_goal(positions):
+    for p in positions:
+        engine.a_star_search(p.cat, p.board, goal=p.bait)
+
+def evaluate(positions):
+    for p in positions:
+        engine.evaluate_board(p.cat, p.board)
+
+def trap_min_cut(positions):
+    for p in positions:
+        min_cut(p.cat, p.board)
+
+
+@pytest.mark.parametrize("kind", KINDS)
+def bench_astar_to_edge(measure, corpus, kind):
+    measure(astar_to_edge, corpus[kind])
+
+@pytest.mark.parametrize("kind", KINDS)
+def bench_astar_to_goal(measure, corpus, kind):
+    measure(astar_to_goal, corpus[kind])
+
+@pytest.mark.parametrize("kind", KINDS)
+def bench_evaluate_board(measure, corpus, kind):
+    measure(evaluate, corpus[kind])
+
+@pytest.mark.parametrize("kind", KINDS)
+def bench_trap_min_cut(measure, corpus, kind):
+    measure(trap_min_cut, corpus[kind])
@@ -0,0 +1,20 @@
+"""game.draw_board() for every corpus position, under the dummy SDL video driver."""
+import pytest
+
+from benchmarks.corpus import KINDS
+
+
+@pytest.mark.parametrize("kind", KINDS)
+def bench_draw_board(measure, game, corpus, kind):
+    states = [p.state() for p in corpus[kind]]
+    original = game.state
+
+    def draw_all():
+        for state in states:
+            game.state = state
+            game.draw_board()
+
+    try:
+        measure(draw_all)
+    finally:
+        game.state = original
@@ -0,0 +1,81 @@
+"""Minimax at fixed depths, find_best_move(), the tablebase and the bait analysis, over the corpus."""
+import math
+import random
+
+import pytest
+
+import block_candidates
+import engine
+from distance_field import EdgeDistanceField
+from transposition import TranspositionTable
+from benchmarks.corpus import KINDS
+
+
+# block_candidates() memoizes by position for the whole process, so every position starts
+# with an empty cache: otherwise later rounds would only measure cache hits
+
+def minimax_all(fields, depth):
+    # Same call as search_root() makes for each cat move; no transposition table
+    for cat, field in fields:
+        block_candidates.cache.clear()
+        engine.minimax(depth, True, cat, field, -math.inf, math.inf)
+
+def find_best_moves(positions):
+    for p in positions:
+        block_candidates.cache.clear()
+        engine.find_best_move(p.state()) # Fresh state, so an empty transposition table
+
+def find_best_moves_on(states):
+    for state in states:
+        fresh = state.copy()
+        fresh.transpositions = TranspositionTable() # Empty table, like find_best_moves()
+        block_candidates.cache.clear()
+        engine.find_best_move(fresh)
+
+def tablebase_probes(positions):
+    for p in positions:
+        engine.probe_tablebase(p.cat, p.board)
+
+def bait_analysis(positions):
+    for p in positions:
+        engine.compute_bait_analysis(p.cat, p.bait, p.board.copy()) # Not the memoized analyze_bait()
+
+
+@pytest.fixture
+def fixed_depth_search(monkeypatch):
+    """find_best_move() searching at exactly MINIMAX_DEPTH, whatever the game is configured for."""
+    monkeypatch.setattr(engine, "SEARCH_TIME_BUDGET_MS", None)
+    monkeypatch.setattr(engine, "USE_TABLEBASE", False) # Measured on its own in bench_tablebase_probe
+    monkeypatch.setattr(engine, "PARALLEL_ROOT_WORKERS", 0)
+    monkeypatch.setattr(engine, "COLLECT_STATS", False)
+
+
+@pytest.mark.parametrize("kind", KINDS)
+@pytest.mark.parametrize("depth", [1, 2, 3, 4, 5])
+def bench_minimax(measure, corpus, kind, depth):
+    fields = [(p.cat, EdgeDistanceField(p.board.copy())) for p in corpus[kind]]
+    measure(minimax_all, fields, depth)
+
+@pytest.mark.parametrize("kind", KINDS)
+def bench_find_best_move(measure, corpus, kind, fixed_depth_search):
+    measure(find_best_moves, corpus[kind])
+
+@pytest.mark.parametrize("kind", KINDS)
+def bench_tablebase_probe(measure, corpus, kind):
+    engine.probe_tablebase(corpus[kind][0].cat, corpus[kind][0].board) # Map the file outside the timing
+    measure(tablebase_probes, corpus[kind])
+
+@pytest.mark.parametrize("kind", KINDS)
+def bench_bait_analysis(measure, corpus, kind):
+    measure(bait_analysis, corpus[kind])
+
+@pytest.mark.parametrize("size", [21, 31, 51])
+def bench_find_best_move_big_board(measure, size, fixed_depth_search):
+    # Fresh games with reset_game()'s random blocks, scaled to the board
+    states = [engine.reset_game(engine.GameState(size), random.Random(seed)) for seed in range(8)]
+    measure(find_best_moves_on, states)
+
+@pytest.mark.parametrize("size", [11, 21])
+def bench_find_best_move_hex(measure, size, fixed_depth_search):
+    states = [engine.reset_game(engine.GameState(size, "hex"), random.Random(seed)) for seed in range(8)]
+    measure(find_best_moves_on, states)
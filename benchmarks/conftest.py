@@ -0,0 +1,195 @@
+"""
+Shared setup for the benchmark suite (pytest-benchmark).
+
+Run from the repository root:
+    python -m pytest benchmarks
+    python -m pytest benchmarks --no-speed-check  # on a busy machine: list slowdowns, never fail on them
+    python -m pytest benchmarks --save-baseline   # after an intended speed change
+
+Every benchmark goes through the `measure` fixture: pytest-benchmark
+times the call, one more call runs under tracemalloc for its peak memory,
+and both are compared with benchmarks/baseline.json. A benchmark fails if
+it needs more memory than its peak, beyond --baseline-tolerance.
+
+Absolute ops/sec drift with the machine's load, so speed is compared
+relative to a calibration run: a fixed piece of pure Python work that no
+change to the game touches, sampled right before and after every
+benchmark. Both use the fastest run. A benchmark slower than the
+baseline's relative speed beyond --baseline-tolerance is listed at the
+end of the run. One that is --max-slowdown times slower (2x) is timed
+again for a few seconds, and fails if it is still that slow, so a burst
+of load cannot fail it but a real regression does. --no-speed-check
+only lists slowdowns. Benchmarks missing from the baseline are only
+reported.
+"""
+import json
+import os
+import platform
+import time
+import tracemalloc
+
+import pytest
+
+# draw_board() needs a display; the dummy drivers work without a window or sound card
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from benchmarks.corpus import make_corpus
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CALIBRATION_ROUNDS = 15  # Calibration runs per sample, the fastest counts
+RECHECK_SECONDS = 2      # How long a benchmark that looks --max-slowdown times slower is timed again
+
+results = {}  # Benchmark name -> {"ops": ..., "relative": ..., "peak_kib": ...} of this run
+slowdowns = [] # Speed regressions of this run, reported at the end
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("baseline")
+    group.addoption("--save-baseline", action="store_true",
+                    help="write this run's results to benchmarks/baseline.json instead of comparing")
+    group.addoption("--baseline-tolerance", type=float, default=0.35,
+                    help="allowed memory growth before a benchmark fails, and slowdown before "
+                         "it is listed (0.35 = 35%%)")
+    group.addoption("--max-slowdown", type=float, default=2.0,
+                    help="fail benchmarks this many times slower than the baseline (default 2)")
+    group.addoption("--no-speed-check", action="store_true",
+                    help="only list slowdowns, for machines too noisy to fail on them")
+
+
+def load_baseline():
+    if not os.path.exists(BASELINE_PATH):
+        return {}
+    with open(BASELINE_PATH) as f:
+        return json.load(f)["benchmarks"]
+
+
+# --- Calibration ---
+def calibration_work():
+    """Breadth-first search over an empty 61x61 grid: lists, dicts and loops, like the engine."""
+    size = 61
+    dist = {0: 0}
+    queue = [0]
+    for i in queue:
+        r, c = divmod(i, size)
+        for n in (i - size if r else -1, i + size if r < size - 1 else -1,
+                  i - 1 if c else -1, i + 1 if c < size - 1 else -1):
+            if n >= 0 and n not in dist:
+                dist[n] = dist[i] + 1
+                queue.append(n)
+    return len(dist)
+
+def calibration_ops():
+    """
+    Calibration runs per second, from the fastest of CALIBRATION_ROUNDS.
+    Load comes in bursts that slow everything down for a second or so, so
+    a benchmark is compared with the faster of a sample taken right before
+    it and one right after: at most one of them falls in the same burst.
+    """
+    best = float("inf")
+    for _ in range(CALIBRATION_ROUNDS):
+        start = time.perf_counter()
+        calibration_work()
+        best = min(best, time.perf_counter() - start)
+    return 1 / best
+
+
+def fastest_call(func, args, seconds):
+    """Seconds of the fastest of repeated calls to func over about `seconds`."""
+    best = float("inf")
+    deadline = time.perf_counter() + seconds
+    while True:
+        start = time.perf_counter()
+        func(*args)
+        end = time.perf_counter()
+        best = min(best, end - start)
+        if end > deadline:
+            return best
+
+
+@pytest.fixture(scope="session")
+def corpus():
+    return make_corpus()
+
+
+@pytest.fixture(scope="session")
+def baseline():
+    return load_baseline()
+
+
+@pytest.fixture
+def measure(request, benchmark, baseline):
+    """measure(func, *args): benchmark func, record its memory peak and check the baseline."""
+    def run(func, *args):
+        before = calibration_ops()
+        result = benchmark(func, *args)
+        calibration = max(before, calibration_ops())
+
+        tracemalloc.start()
+        func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_kib = peak / 1024
+        benchmark.extra_info["peak_kib"] = round(peak_kib, 1)
+
+        if benchmark.stats is None:
+            return result # --benchmark-disable: nothing was timed
+        ops = 1 / benchmark.stats.stats.min # Fastest round, like the calibration
+        relative = ops / calibration
+        benchmark.extra_info["relative"] = round(relative, 4)
+        name = request.node.name
+        results[name] = {"ops": round(ops, 1), "relative": round(relative, 4), "peak_kib": round(peak_kib, 1)}
+
+        expected = baseline.get(name)
+        if expected and not request.config.getoption("--save-baseline"):
+            tolerance = request.config.getoption("--baseline-tolerance")
+            if peak_kib > expected["peak_kib"] * (1 + tolerance) + 1:
+                pytest.fail(f"{name}: peak {peak_kib:,.1f} KiB, baseline {expected['peak_kib']:,.1f} KiB")
+            if "relative" not in expected:
+                return result
+            limit = expected["relative"] / request.config.getoption("--max-slowdown")
+            check_speed = not request.config.getoption("--no-speed-check")
+            if check_speed and relative < limit:
+                # Likely a burst of load; only a second slow measurement counts
+                before = calibration_ops()
+                seconds = fastest_call(func, args, RECHECK_SECONDS)
+                again = 1 / seconds / max(before, calibration_ops())
+                relative = max(relative, again)
+            message = (f"{name}: {relative:.4f} x calibration, baseline {expected['relative']:.4f} "
+                       f"({relative / expected['relative'] - 1:+.0%})")
+            if check_speed and relative < limit:
+                pytest.fail(message)
+            if relative < expected["relative"] * (1 - tolerance):
+                slowdowns.append(message)
+        return result
+    return run
+
+
+@pytest.fixture(scope="session")
+def game():
+    """game.py, imported from the repository root so its assets load."""
+    os.chdir(ROOT)
+    import game
+    return game
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if slowdowns:
+        terminalreporter.section("slower than baseline by more than --baseline-tolerance")
+        for message in slowdowns:
+            terminalreporter.write_line(message)
+
+
+def pytest_sessionfinish(session):
+    if session.config.getoption("--save-baseline") and results:
+        saved = load_baseline()
+        saved.update(results)
+        with open(BASELINE_PATH, "w") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "benchmarks": dict(sorted(saved.items())),
+            }, f, indent=2)
+            f.write("\n")
@@ -0,0 +1,114 @@
+"""
+Fixed, seeded board positions for the benchmark suite.
+
+Four kinds, POSITIONS_PER_KIND of each, always generated the same way:
+  open            the cat in the middle, reset_game()'s 8 random blocks
+  half_blocked    half the board blocked, the cat still has a way out
+  nearly_trapped  a closed ring of blocks around the cat with one gap
+  near_edge       the cat one step from the edge, a few blocks around
+
+Every position also has a bait tile two to four steps from the cat.
+"""
+import random
+
+import engine
+from board import Board
+
+KINDS = ("open", "half_blocked", "nearly_trapped", "near_edge")
+POSITIONS_PER_KIND = 8
+
+
+class Position:
+    def __init__(self, kind, cat, board, bait):
+        self.kind = kind
+        self.cat = cat     # Cell index
+        self.board = board # Board, copy it before changing it
+        self.bait = bait   # Cell index
+
+    def state(self):
+        """A fresh GameState for this position."""
+        state = engine.GameState()
+        state.blocked = self.board.copy()
+        state.cat_pos = engine.GRID.cell(self.cat)
+        state.bait = engine.GRID.cell(self.bait)
+        return state
+
+
+def block_randomly(board, count, rng, keep=()):
+    grid = board.grid
+    while board.count < count:
+        i = rng.randrange(grid.cells)
+        if i not in keep and not board.cells[i]:
+            board.block(i)
+
+
+def open_position(rng):
+    grid = engine.GRID
+    cat = grid.index((grid.size // 2, grid.size // 2))
+    board = Board(grid)
+    block_randomly(board, engine.INITIAL_BLOCKS, rng, keep=(cat,))
+    return cat, board
+
+def half_blocked_position(rng):
+    grid = engine.GRID
+    cat = grid.index((grid.size // 2, grid.size // 2))
+    board = Board(grid)
+    cells = list(range(grid.cells))
+    rng.shuffle(cells)
+    for i in cells:
+        if board.count >= grid.cells // 2:
+            break
+        if i == cat:
+            continue
+        board.block(i)
+        if engine.a_star_search(cat, board) is None:
+            board.unblock(i) # Keep a way out
+    return cat, board
+
+def nearly_trapped_position(rng):
+    grid = engine.GRID
+    r, c = grid.size // 2, grid.size // 2
+    cat = grid.index((r, c))
+    board = Board(grid)
+    # Cells exactly 3 steps away form a closed wall for a cat moving in 4 directions
+    ring = [grid.index((r + dr, c + dc)) for dr in range(-3, 4) for dc in range(-3, 4) if abs(dr) + abs(dc) == 3]
+    gap = rng.choice(ring)
+    for i in ring:
+        if i != gap:
+            board.block(i)
+    block_randomly(board, board.count + 6, rng, keep=(cat, gap))
+    return cat, board
+
+def near_edge_position(rng):
+    grid = engine.GRID
+    cat = rng.choice([i for i in range(grid.cells) if grid.edge_distance[i] == 1])
+    board = Board(grid)
+    block_randomly(board, rng.randint(8, 16), rng, keep=(cat,))
+    return cat, board
+
+GENERATORS = {
+    "open": open_position,
+    "half_blocked": half_blocked_position,
+    "nearly_trapped": nearly_trapped_position,
+    "near_edge": near_edge_position,
+}
+
+
+def pick_bait(cat, board, rng):
+    grid = board.grid
+    near = [i for i in range(grid.cells)
+            if not board.cells[i] and 2 <= abs(grid.rows[i] - grid.rows[cat]) + abs(grid.cols[i] - grid.cols[cat]) <= 4]
+    return rng.choice(near)
+
+
+def make_corpus(seed=2024):
+    """{kind: [Position, ...]}, identical for the same seed."""
+    rng = random.Random(seed)
+    corpus = {}
+    for kind in KINDS:
+        positions = []
+        for _ in range(POSITIONS_PER_KIND):
+            cat, board = GENERATORS[kind](rng)
+            positions.append(Position(kind, cat, board, pick_bait(cat, board, rng)))
+        corpus[kind] = positions
+    return corpus
@@ -0,0 +1,60 @@
+"""
+PVS: nodes searched with and without it.
+
+Runs find_best_move() at a fixed depth on every corpus position twice:
+plain alpha-beta and with PVS (null-window search). Both order moves the
+same way, the transposition table's best move first, then by edge
+distance. Each run starts with an empty transposition table. Both must
+pick the same score and the same tied best moves; only the node counts
+may differ.
+
+Run from the repository root:
+    python -m benchmarks.move_ordering [--depth 3 4 5]
+"""
+import argparse
+
+import engine
+from benchmarks.corpus import KINDS, make_corpus
+
+CONFIGS = (
+    ("plain alpha-beta", False),
+    ("PVS", True),
+)
+
+
+def search_all(positions, depth, pvs):
+    """Total nodes and the (score, best moves) of every position."""
+    engine.MINIMAX_DEPTH = depth
+    engine.PVS = pvs
+    nodes = 0
+    results = []
+    for position in positions:
+        state = position.state()
+        engine.find_best_move(state)
+        nodes += state.last_search.nodes
+        results.append((state.last_search.score, state.last_search.best_moves))
+    return nodes, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--depth", type=int, nargs="+", default=[3, 4, 5])
+    args = parser.parse_args()
+
+    engine.USE_TABLEBASE = False # Solved positions would not be searched at all
+    corpus = make_corpus()
+    positions = [p for kind in KINDS for p in corpus[kind]]
+    for depth in args.depth:
+        print(f"depth {depth}, {len(positions)} positions")
+        reference = None
+        for name, pvs in CONFIGS:
+            nodes, results = search_all(positions, depth, pvs)
+            if reference is None:
+                reference = (nodes, results)
+            elif results != reference[1]:
+                raise SystemExit(f"{name} chose different moves than plain alpha-beta at depth {depth}")
+            print(f"  {name:<18} {nodes:9,} nodes  {reference[0] / nodes:5.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Node throughput: A* evaluation vs. the edge-distance field.
+
+Walks the same Minimax-shaped tree (player blocks next to the cat, cat
+moves) from a set of seeded positions twice: once evaluating every node
+with evaluate_board() (a fresh A* per node) and once with an
+EdgeDistanceField that is updated incrementally as blocks are made and
+unmade. Both must agree on every value.
+
+Run from the repository root:
+    python -m benchmarks.node_throughput [--depth 4] [--positions 40]
+"""
+import argparse
+import random
+import time
+
+import engine
+from board import Board
+from distance_field import EdgeDistanceField
+
+
+# Seeded start positions: cat somewhere inside, a varying number of blocks
+def make_positions(count, seed=1):
+    rng = random.Random(seed)
+    grid = engine.GRID
+    positions = []
+    for _ in range(count):
+        cat = grid.index((rng.randint(2, grid.size - 3), rng.randint(2, grid.size - 3)))
+        board = Board(grid)
+        target = rng.choice([8, 16, 28, 40])
+        while board.count < target:
+            i = rng.randrange(grid.cells)
+            if i != cat and not board.cells[i]:
+                board.block(i)
+        positions.append((cat, board))
+    return positions
+
+
+def walk_astar(depth, is_cat, cat, board, values):
+    values.append(engine.evaluate_board(cat, board))
+    if depth == 0:
+        return
+    for n in board.grid.neighbors[cat]:
+        if board.cells[n]:
+            continue
+        if is_cat:
+            walk_astar(depth - 1, False, n, board, values)
+        else:
+            board.block(n)
+            walk_astar(depth - 1, True, cat, board, values)
+            board.unblock(n)
+
+
+def walk_field(depth, is_cat, cat, field, values):
+    values.append(field.evaluate(cat))
+    if depth == 0:
+        return
+    cells = field.board.cells
+    for n in field.grid.neighbors[cat]:
+        if cells[n]:
+            continue
+        if is_cat:
+            walk_field(depth - 1, False, n, field, values)
+        else:
+            field.block(n)
+            walk_field(depth - 1, True, cat, field, values)
+            field.undo()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--positions", type=int, default=40)
+    args = parser.parse_args()
+
+    positions = make_positions(args.positions)
+
+    astar_values = []
+    start = time.perf_counter()
+    for cat, board in positions:
+        walk_astar(args.depth, False, cat, board.copy(), astar_values)
+    astar_time = time.perf_counter() - start
+
+    field_values = []
+    start = time.perf_counter()
+    for cat, board in positions:
+        walk_field(args.depth, False, cat, EdgeDistanceField(board.copy()), field_values)
+    field_time = time.perf_counter() - start
+
+    if astar_values != field_values:
+        raise SystemExit("Mismatch: the distance field disagrees with evaluate_board()")
+
+    nodes = len(astar_values)
+    print(f"{nodes} nodes, depth {args.depth}, {len(positions)} positions")
+    print(f"  A* per node     {nodes / astar_time:12,.0f} nodes/s")
+    print(f"  distance field  {nodes / field_time:12,.0f} nodes/s  ({astar_time / field_time:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Parallel vs. serial root search in find_best_move().
+
+Searches the same seeded positions at a fixed depth once serially and
+once with engine.PARALLEL_ROOT_WORKERS processes, checks that both
+choose from the same set of best moves and reports the wall-clock
+speedup.
+
+Run from the repository root:
+    python -m benchmarks.parallel_root [--depth 6] [--workers 4]
+"""
+import argparse
+import os
+import time
+
+import block_candidates
+import engine
+import parallel_search
+from benchmarks.node_throughput import make_positions
+
+
+def run(positions, depth, workers):
+    engine.MINIMAX_DEPTH = depth
+    engine.SEARCH_TIME_BUDGET_MS = None
+    engine.PARALLEL_ROOT_WORKERS = workers
+    results = []
+    start = time.perf_counter()
+    for cat, board in positions:
+        state = engine.GameState()
+        state.cat_pos = engine.GRID.cell(cat)
+        state.blocked = board.copy()
+        block_candidates.cache.clear() # Not warmed by the serial run
+        engine.find_best_move(state)
+        results.append((state.last_search.score, sorted(state.last_search.best_moves)))
+    return results, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--depth", type=int, default=6)
+    parser.add_argument("--positions", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    positions = make_positions(args.positions)
+    serial, serial_time = run(positions, args.depth, 0)
+    engine.PARALLEL_ROOT_WORKERS = args.workers
+    parallel_search.get_pool() # Start the workers before timing
+    parallel, parallel_time = run(positions, args.depth, args.workers)
+    parallel_search.shutdown()
+
+    if serial != parallel:
+        raise SystemExit("Mismatch: parallel search chose from a different set of best moves")
+
+    print(f"{len(positions)} positions, depth {args.depth}, {args.workers} workers")
+    print(f"  serial    {serial_time:8.3f} s")
+    print(f"  parallel  {parallel_time:8.3f} s  ({serial_time / parallel_time:.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
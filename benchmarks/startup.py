@@ -0,0 +1,72 @@
+"""
+Time to first frame: importing game.py and putting one frame on screen.
+
+Each run is a fresh interpreter under the dummy SDL drivers, timed from
+before `import game` until the first draw_board() is pushed to the
+display, the same span the game shows above the frame time (F3).
+Importing pygame alone takes most of that and varies from run to run,
+so the time after it is reported too. Runs go in pairs: a cold start
+with no sprite atlas, then a warm start that reads the atlas the cold
+one saved (asset_manager.py).
+
+Run from the repository root:
+    python -m benchmarks.startup [--runs 10]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FIRST_FRAME = """
+import sys, time
+start = time.perf_counter()
+import pygame
+imported = time.perf_counter()
+import asset_manager
+class RunAssets(asset_manager.AssetManager): # This run's atlas instead of the game's own
+    def __init__(self, atlas_path=None):
+        super().__init__(sys.argv[1])
+asset_manager.AssetManager = RunAssets
+import game
+game.reset_game()
+game.draw_board()
+pygame.display.update()
+end = time.perf_counter()
+print((end - start) * 1000, (end - imported) * 1000)
+game.assets.save_atlas()
+"""
+
+
+def first_frame_ms(atlas_path):
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+    out = subprocess.run([sys.executable, "-c", FIRST_FRAME, atlas_path], cwd=ROOT, env=env,
+                         capture_output=True, text=True, check=True).stdout
+    total, after_pygame = out.split()[-2:]
+    return float(total), float(after_pygame)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    cold, warm = [], []
+    with tempfile.TemporaryDirectory() as tmp:
+        for run in range(args.runs):
+            atlas = os.path.join(tmp, f"run{run}.atlas")
+            cold.append(first_frame_ms(atlas))
+            warm.append(first_frame_ms(atlas))
+
+    print(f"{'':<16} {'first frame':>18}  {'after pygame import':>22}")
+    for name, runs in (("cold (no atlas)", cold), ("warm (atlas)", warm)):
+        total, after_pygame = zip(*runs)
+        print(f"{name:<16} median {statistics.median(total):6.1f} ms  "
+              f"median {statistics.median(after_pygame):6.1f} ms  min {min(after_pygame):6.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+The player's moves in the cat's Minimax: blocks on the cat's ways out.
+
+A real player does not only block the tiles next to the cat. A block
+further out, where every shortest way out squeezes through one tile, does
+more, and a search that never considers it thinks the cat is safer than
+it is. Trying every free tile would blow up the search, so the
+candidates come from the cat's shortest ways out instead: the union of
+all of them is the cells reachable by walking downhill in the
+edge-distance field (distance_field.py), one level of equal distance at
+a time. A level that is a single cell is a chokepoint that every
+shortest way out passes. The player tries the cat's next steps first,
+then the chokepoints nearest the cat, at most beam_width tiles.
+
+The field is kept up to date incrementally as Minimax blocks and
+unblocks tiles, so the candidates of a node cost a walk over a few
+levels, not a search. They are also memoized by position: PVS
+re-searches, deeper iterations and the next turn's search meet the same
+positions again.
+"""
+from distance_field import UNREACHABLE
+
+CACHE_SIZE = 100_000 # Positions whose candidates are kept, oldest evicted first
+MAX_LEVEL_CELLS = 4  # Stop looking for chokepoints once the ways out fan out this wide
+
+cache = {} # (grid, board hash, cat, beam width, lookahead, can_attack) -> tuple of candidate cells
+
+
+def next_steps(cat, field):
+    """The cat's open neighbours that lead out (none further than one step back), closest to the edge first."""
+    dist = field.dist
+    reach = dist[cat] + 1
+    return sorted((n for n in field.grid.neighbors[cat] if dist[n] <= reach and dist[n] < UNREACHABLE),
+                  key=dist.__getitem__)
+
+
+def attack_steps(cat, field):
+    """Open cells the cat could reach by breaking one block next to it, closest to the edge first."""
+    dist = field.dist
+    cells = field.board.cells
+    neighbors = field.grid.neighbors
+    steps = {n for b in neighbors[cat] if cells[b] for n in neighbors[b]
+             if n != cat and dist[n] < UNREACHABLE}
+    return sorted(steps, key=dist.__getitem__)
+
+
+def chokepoints(starts, field, lookahead):
+    """
+    Cells that every shortest way out from starts (cells at the same edge
+    distance) passes, nearest first, looking at most lookahead levels ahead.
+    """
+    dist = field.dist
+    neighbors = field.grid.neighbors
+    found = []
+    level = starts
+    for _ in range(lookahead):
+        step = dist[level[0]] - 1
+        if step < 0:
+            break # At the edge
+        level = list({n for v in level for n in neighbors[v] if dist[n] == step})
+        if len(level) == 1:
+            found.append(level[0])
+        elif len(level) > MAX_LEVEL_CELLS:
+            break
+    return found
+
+
+def compute_candidates(cat, field, beam_width, lookahead, can_attack):
+    starts = next_steps(cat, field)
+    if not starts and can_attack:
+        starts = attack_steps(cat, field) # Walled in: block where the attack would lead
+    candidates = starts[:beam_width]
+    if starts and len(candidates) < beam_width:
+        closest = [n for n in starts if field.dist[n] == field.dist[starts[0]]]
+        candidates += chokepoints(closest, field, lookahead)[:beam_width - len(candidates)]
+    return candidates
+
+
+def block_candidates(cat, field, beam_width, lookahead, can_attack=False):
+    """
+    Tiles the player considers blocking, best first: the cat's next steps
+    out, then the chokepoints of its shortest ways out up to lookahead
+    levels further, nearest first, at most beam_width tiles. Returns a new list.
+    """
+    key = (field.grid, field.board.hash, cat, beam_width, lookahead, can_attack)
+    candidates = cache.get(key)
+    if candidates is None:
+        candidates = tuple(compute_candidates(cat, field, beam_width, lookahead, can_attack))
+        if len(cache) >= CACHE_SIZE:
+            del cache[next(iter(cache))] # Oldest first
+        cache[key] = candidates
+    return list(candidates)
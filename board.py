@@ -0,0 +1,160 @@
+"""
+Compact board representation for the AI hot path.
+
+Cells are numbered r * size + c. A Grid holds everything that only depends
+on the board size and topology (neighbour lists, edge flags, edge
+distances, Zobrist keys) and is built once. The topology is "square"
+(4 neighbours) or "hex": offset rows, every odd row shifted half a cell to
+the right, 6 neighbours. A Board is the set of blocked cells stored as a
+bytearray, so adding or removing a block is a single byte write plus one
+XOR on its Zobrist hash instead of copying a set of tuples.
+"""
+from transposition import ZobristKeys
+
+
+# --- Grid Topology ---
+TOPOLOGIES = ("square", "hex")
+ZOBRIST_SEEDS = {"square": 0x7A7C, "hex": 0x4E58} # Separate keys, so a square and a hex position never share a hash
+
+# (row, col) steps to the neighbours. Square: same order as the original
+# get_neighbors(), Up, Down, Left, Right. Hex rows are offset, so even and
+# odd rows reach the rows above and below with different column steps.
+SQUARE_STEPS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+HEX_STEPS = (
+    ((-1, -1), (-1, 0), (0, -1), (0, 1), (1, -1), (1, 0)), # Even rows
+    ((-1, 0), (-1, 1), (0, -1), (0, 1), (1, 0), (1, 1)),   # Odd rows (shifted right)
+)
+
+
+class Grid:
+    """Precomputed per-size tables, indexed by cell number."""
+
+    def __init__(self, size, topology="square"):
+        if topology not in TOPOLOGIES:
+            raise ValueError(f"Unknown topology {topology!r}, expected one of {TOPOLOGIES}")
+        self.size = size
+        self.topology = topology
+        self.hex = topology == "hex"
+        self.cells = size * size
+        self.rows = tuple(i // size for i in range(self.cells))
+        self.cols = tuple(i % size for i in range(self.cells))
+        # Axial column of every cell on a hex board (cube coordinates without the third axis)
+        self.axial = tuple(c - (r - (r & 1)) // 2 for r, c in zip(self.rows, self.cols))
+
+        neighbors = []
+        for i in range(self.cells):
+            r, c = self.rows[i], self.cols[i]
+            steps = HEX_STEPS[r & 1] if self.hex else SQUARE_STEPS
+            neighbors.append(tuple(
+                (r + dr) * size + (c + dc)
+                for dr, dc in steps
+                if 0 <= r + dr < size and 0 <= c + dc < size
+            ))
+        self.neighbors = tuple(neighbors)
+
+        # Fewest moves to the closest edge on an empty board, 0 on the edge itself.
+        # Every move changes the row and the column by at most one, on both topologies.
+        self.edge_distance = tuple(
+            min(r, size - 1 - r, c, size - 1 - c) for r, c in zip(self.rows, self.cols)
+        )
+        self.is_edge = bytes(1 if d == 0 else 0 for d in self.edge_distance)
+        self.edge_cells = tuple(i for i in range(self.cells) if self.is_edge[i])
+
+        self.zobrist = ZobristKeys(self.cells, ZOBRIST_SEEDS[topology])
+
+    # Pickled as just its size and topology; the tables are rebuilt (once) on the other side
+    def __reduce__(self):
+        return (grid_for, (self.size, self.topology))
+
+    def index(self, cell):
+        return cell[0] * self.size + cell[1]
+
+    def cell(self, i):
+        return (self.rows[i], self.cols[i])
+
+    def distance(self, i, j):
+        """Fewest moves between two cells on an empty board."""
+        dr = self.rows[j] - self.rows[i]
+        if self.hex:
+            dq = self.axial[j] - self.axial[i]
+            return (abs(dq) + abs(dr) + abs(dq + dr)) // 2
+        return abs(dr) + abs(self.cols[j] - self.cols[i])
+
+
+GRIDS = {}
+
+def grid_for(size, topology="square"):
+    """The shared Grid for a board size and topology, built on first use."""
+    grid = GRIDS.get((size, topology))
+    if grid is None:
+        grid = GRIDS[(size, topology)] = Grid(size, topology)
+    return grid
+
+
+# --- Board ---
+class Board:
+    """
+    Blocked cells of one position. Hot code uses the index methods
+    (block/unblock and the cells bytearray); the UI and rule code can
+    treat it like the old set of (row, col) tuples.
+    """
+    __slots__ = ("grid", "cells", "hash", "count")
+
+    def __init__(self, grid, blocked=()):
+        self.grid = grid
+        self.cells = bytearray(grid.cells) # 1 = blocked
+        self.hash = 0                      # Zobrist hash of the blocked cells
+        self.count = 0
+        for cell in blocked:
+            self.add(cell)
+
+    # --- Index API (AI hot path) ---
+    def block(self, i):
+        self.cells[i] = 1
+        self.hash ^= self.grid.zobrist.blocked[i]
+        self.count += 1
+
+    def unblock(self, i):
+        self.cells[i] = 0
+        self.hash ^= self.grid.zobrist.blocked[i]
+        self.count -= 1
+
+    def copy(self):
+        other = Board.__new__(Board)
+        other.grid = self.grid
+        other.cells = bytearray(self.cells)
+        other.hash = self.hash
+        other.count = self.count
+        return other
+
+    # --- Set-like API over (row, col) tuples ---
+    def add(self, cell):
+        i = self.grid.index(cell)
+        if not self.cells[i]:
+            self.block(i)
+
+    def remove(self, cell):
+        i = self.grid.index(cell)
+        if not self.cells[i]:
+            raise KeyError(cell)
+        self.unblock(i)
+
+    def __contains__(self, cell):
+        r, c = cell
+        size = self.grid.size
+        return 0 <= r < size and 0 <= c < size and self.cells[r * size + c] == 1
+
+    def __iter__(self):
+        cell = self.grid.cell
+        return (cell(i) for i, v in enumerate(self.cells) if v)
+
+    def __len__(self):
+        return self.count
+
+    def __eq__(self, other):
+        if isinstance(other, Board):
+            return self.cells == other.cells
+        return set(self) == other
+
+    def __repr__(self):
+        return f"Board({sorted(self)})"
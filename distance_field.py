@@ -0,0 +1,162 @@
+"""
+Edge-distance field: the distance from every cell to the board edge.
+
+Every move costs 1, so one breadth-first search from all open edge cells
+at once gives the distance to the edge for the whole board. That replaces
+running A* from the cat each time. Adding or removing one block only
+changes the cells whose shortest way out goes through that tile, so the
+field is updated incrementally and every change can be undone. Minimax
+uses that to make and unmake player blocks.
+"""
+from collections import deque
+import heapq
+
+UNREACHABLE = 1 << 30 # Distance of blocked cells and cells with no way out
+
+
+class EdgeDistanceField:
+    """
+    Distance to the nearest edge for every cell of a Board. The field
+    owns its board: blocks must be added and removed through block(),
+    unblock() and undo() so both stay in sync.
+    """
+
+    def __init__(self, board):
+        self.board = board
+        self.grid = board.grid
+        self.dist = [UNREACHABLE] * self.grid.cells
+        self.history = [] # One list of (cell, old distance) per change, for undo()
+        self.recompute()
+
+    def recompute(self):
+        """Full multi-source BFS from every open edge cell."""
+        cells = self.board.cells
+        neighbors = self.grid.neighbors
+        dist = [UNREACHABLE] * self.grid.cells
+        queue = deque()
+        for i in self.grid.edge_cells:
+            if not cells[i]:
+                dist[i] = 0
+                queue.append(i)
+        while queue:
+            current = queue.popleft()
+            d = dist[current] + 1
+            for n in neighbors[current]:
+                if not cells[n] and dist[n] > d:
+                    dist[n] = d
+                    queue.append(n)
+        self.dist = dist
+        self.history.clear()
+
+    def evaluate(self, cat):
+        """Same value as engine.evaluate_board(), read from the field."""
+        d = self.dist[cat]
+        if d == 0:
+            return 1000
+        if d == UNREACHABLE:
+            return -1000
+        return -(d + 1) # evaluate_board() counts the tiles on the path, start included
+
+    def block(self, i):
+        """Blocks cell i. Only cells whose every shortest way out passed through i change."""
+        self.board.block(i)
+        dist = self.dist
+        old = dist[i]
+        changes = [(i, old)]
+        self.history.append(changes)
+        dist[i] = UNREACHABLE
+        if old == UNREACHABLE:
+            return
+
+        cells = self.board.cells
+        neighbors = self.grid.neighbors
+
+        # Find the cells that lost all their shortest-path parents, level by level
+        affected = {i}
+        frontier = [i]
+        level = old
+        while frontier:
+            next_frontier = []
+            for current in frontier:
+                for v in neighbors[current]:
+                    if v in affected or cells[v] or dist[v] != level + 1:
+                        continue
+                    supported = False
+                    for u in neighbors[v]:
+                        if dist[u] == level and u not in affected and not cells[u]:
+                            supported = True
+                            break
+                    if not supported:
+                        affected.add(v)
+                        next_frontier.append(v)
+            frontier = next_frontier
+            level += 1
+        affected.discard(i)
+        if not affected:
+            return
+
+        # Re-seed the affected cells from their unaffected neighbours and re-run BFS inside them
+        for v in affected:
+            changes.append((v, dist[v]))
+            dist[v] = UNREACHABLE
+        heap = []
+        for v in affected:
+            best = UNREACHABLE
+            for u in neighbors[v]:
+                if u not in affected and dist[u] + 1 < best:
+                    best = dist[u] + 1
+            if best < UNREACHABLE:
+                dist[v] = best
+                heap.append((best, v))
+        heapq.heapify(heap)
+        while heap:
+            d, current = heapq.heappop(heap)
+            if d != dist[current]:
+                continue
+            d += 1
+            for n in neighbors[current]:
+                if n in affected and dist[n] > d:
+                    dist[n] = d
+                    heapq.heappush(heap, (d, n))
+
+    def unblock(self, i):
+        """Opens cell i. Distances can only shrink, spreading out from i."""
+        self.board.unblock(i)
+        dist = self.dist
+        cells = self.board.cells
+        neighbors = self.grid.neighbors
+        changes = [(i, dist[i])]
+        self.history.append(changes)
+
+        if self.grid.is_edge[i]:
+            d = 0
+        else:
+            d = UNREACHABLE
+            for n in neighbors[i]:
+                if not cells[n] and dist[n] + 1 < d:
+                    d = dist[n] + 1
+        dist[i] = d
+        if d == UNREACHABLE:
+            return
+
+        queue = deque((i,))
+        while queue:
+            current = queue.popleft()
+            d = dist[current] + 1
+            for n in neighbors[current]:
+                if not cells[n] and dist[n] > d:
+                    changes.append((n, dist[n]))
+                    dist[n] = d
+                    queue.append(n)
+
+    def undo(self):
+        """Reverts the last block() or unblock()."""
+        changes = self.history.pop()
+        dist = self.dist
+        for cell, old in reversed(changes):
+            dist[cell] = old
+        i = changes[0][0]
+        if self.board.cells[i]:
+            self.board.unblock(i)
+        else:
+            self.board.block(i)
@@ -0,0 +1,727 @@
+"""
+Headless game engine for Trap The Cat.
+
+Holds the game state, the rules and the cat AI (A* and Minimax).
+Nothing in here imports pygame, so batch workers and benchmarks can run
+whole games without a window or an audio mixer.
+"""
+import random
+import heapq
+import math
+import time
+
+from board import grid_for, Board
+from distance_field import EdgeDistanceField
+from transposition import TranspositionTable, DEFAULT_TABLE_SIZE
+from instrumentation import TurnStats, phase
+from trap_cut import can_trap_in_one
+from tablebase import tablebase_for
+from block_candidates import block_candidates
+
+# --- Basic Settings ---
+GRID_SIZE = 11 # Default board size; odd is best for a central start. GameState(size) picks another
+BOARD_SIZES = (11, 21, 31, 51) # Sizes the game offers; any size >= 3 works
+BOARD_TOPOLOGY = "square" # "square" (4 neighbours) or "hex" (6, like the original Trap The Cat)
+MINIMAX_DEPTH = 3 # Adjust for difficulty/performance. 2-3 is a good balance.
+INITIAL_BLOCKS = 8 # Random blocks placed by reset_game() on an 11x11 board, scaled by area on others
+TRANSPOSITION_TABLE_SIZE = DEFAULT_TABLE_SIZE
+# Per-turn time budget for iterative deepening. None searches to exactly MINIMAX_DEPTH.
+SEARCH_TIME_BUDGET_MS = None
+MAX_SEARCH_DEPTH = 12 # Deepest iteration tried when a time budget is set
+PLAYER_BEAM_WIDTH = 3 # Blocks Minimax's player tries per turn: the cat's next steps, then chokepoints further out
+PLAYER_LOOKAHEAD = 3 # How many tiles along the cat's shortest ways out chokepoints are looked for (block_candidates.py)
+TRAP_CUT_CHECK = True # Minimax scores a cat the player can wall in with one block as lost (trap_cut.py)
+USE_TABLEBASE = True # find_best_move() plays solved escapes near the edge from tablebase.py without searching
+PVS = True # Principal variation search: moves after the first only have to prove they are worse, with a null window
+PARALLEL_ROOT_WORKERS = 0 # Processes that search root moves in parallel, 0 = search serially
+COLLECT_STATS = False # Fill state.last_stats with a TurnStats every cat turn (debug overlay, profiling)
+# Settings worker processes copy from the parent to search like it (ai_worker.py, parallel_search.py).
+# A new search setting belongs here too, or the workers keep its default.
+ENGINE_SETTINGS = (
+    "MINIMAX_DEPTH", "SEARCH_TIME_BUDGET_MS", "MAX_SEARCH_DEPTH", "TRANSPOSITION_TABLE_SIZE", "COLLECT_STATS",
+    "TRAP_CUT_CHECK", "USE_TABLEBASE", "PVS", "PLAYER_BEAM_WIDTH", "PLAYER_LOOKAHEAD",
+)
+INFINITY = float('inf')
+
+GRID = grid_for(GRID_SIZE, BOARD_TOPOLOGY) # Neighbour tables, edge flags and Zobrist keys of the default size, built once
+
+# TurnStats of the cat turn being planned, None unless COLLECT_STATS is on (a_star_search() reports to it)
+turn_stats = None
+
+
+# --- Game State ---
+class GameState:
+    """Everything that describes one game, independent of how it is drawn."""
+
+    def __init__(self, size=GRID_SIZE, topology=BOARD_TOPOLOGY):
+        self.blocked = Board(grid_for(size, topology)) # Set-like over (row, col), see board.py
+        self.bait = None
+        self.cat_ignored_bait = False
+        self.cat_pos = (size // 2, size // 2)
+        self.game_over = False
+        self.winner = None
+        self.bait_used = False
+        self.cat_attacked_this_turn = False
+        self.cat_has_attacked_in_game = False # Tracks the one attack per game
+        self.seed = None # Game seed (recording.py): fixes the cat's tie-breaks; None uses the module RNG
+        self.turn = 0    # Player actions so far
+        # Minimax results, shared by all root moves and kept for the whole game
+        self.transpositions = TranspositionTable(TRANSPOSITION_TABLE_SIZE)
+        self.last_search = None # SearchInfo of the cat's most recent find_best_move()
+        self.last_stats = None  # TurnStats of the cat's last turn, with COLLECT_STATS on
+
+    @property
+    def grid(self):
+        """The board's Grid; all of the game's tables come from it."""
+        return self.blocked.grid
+
+    def copy(self):
+        """Independent copy of the game for planning elsewhere; the transposition table is shared."""
+        other = GameState.__new__(GameState)
+        other.__dict__.update(self.__dict__)
+        other.blocked = self.blocked.copy()
+        return other
+
+    # The transposition table can be large and is only a cache, so it is not pickled
+    def __getstate__(self):
+        data = self.__dict__.copy()
+        del data['transpositions']
+        return data
+
+    def __setstate__(self, data):
+        self.__dict__.update(data)
+        self.transpositions = TranspositionTable(TRANSPOSITION_TABLE_SIZE)
+
+
+# The cat's choice for one turn, computed by plan_cat_turn() and applied by apply_cat_turn()
+class CatDecision:
+    def __init__(self, move, reason="regular", attack=None, ignore_bait=False):
+        self.move = move               # Tile the cat moves to, None if it is trapped
+        self.reason = reason           # "regular", "bait" or "attack_then_move"
+        self.attack = attack           # Blocked tile the cat breaks before moving, if any
+        self.ignore_bait = ignore_bait # True once the cat decided the bait is a trap
+
+    def __repr__(self):
+        return f"CatDecision(move={self.move}, reason={self.reason!r}, attack={self.attack})"
+
+
+# --- Search Bookkeeping ---
+class SearchTimeout(Exception):
+    """Raised inside minimax() when the turn's time budget has run out."""
+
+
+class SearchContext:
+    """State shared by every minimax() call of one search."""
+
+    def __init__(self, table=None, deadline=None):
+        self.table = table       # TranspositionTable, or None
+        self.deadline = deadline # time.perf_counter() value to give up at, or None
+        self.nodes = 0
+        self.cutoffs = 0
+        self.can_attack = False  # The cat still has its attack in this search
+
+
+class SearchInfo:
+    """What find_best_move() did: depth reached, nodes searched and time spent."""
+
+    def __init__(self):
+        self.depth = 0          # Deepest completed iteration
+        self.nodes = 0          # Nodes visited, including an unfinished last iteration
+        self.elapsed_ms = 0.0
+        self.score = None
+        self.best_moves = []    # Tied best (attack, move) root options of the deepest completed iteration
+        self.timed_out = False  # True if the time budget cut an iteration short
+        self.cutoffs = 0        # Alpha-beta cutoffs
+        self.tt_hits = 0        # Transposition table probes answered / not answered
+        self.tt_misses = 0
+        self.tablebase = None   # Moves to the edge read from the tablebase (nothing was searched), or None
+
+    def __repr__(self):
+        return (f"SearchInfo(depth={self.depth}, nodes={self.nodes}, "
+                f"elapsed_ms={self.elapsed_ms:.1f}, score={self.score})")
+
+
+# --- Helper Functions ---
+# Returns the neighbors of a cell, ensuring they are within bounds
+def get_neighbors(pos, grid=GRID):
+    return [grid.cell(n) for n in grid.neighbors[grid.index(pos)]]
+
+
+# --- Edge Of Grid Detection ---
+def is_at_edge(pos, grid=GRID):
+    return grid.is_edge[grid.index(pos)] == 1
+
+# --- AI ALGORITHMS (A* and Minimax) ---
+# Everything below works on a Board and cell indices (see board.py).
+
+def a_star_search(start, board, goal=None):
+    """
+    Finds the shortest path using A*, as a list of cell indices.
+    If goal is provided, it paths to that specific tile.
+    If goal is None, it paths to the nearest edge.
+    """
+    grid = board.grid
+    if goal is None and grid.is_edge[start]:
+        return [start]
+
+    cells = board.cells
+    neighbors = grid.neighbors
+    if goal is None:
+        h = grid.edge_distance # Manhattan distance to the closest edge
+    else:
+        # Empty-board distance to the goal tile, only for the cells the search reaches
+        h = GoalDistance(grid, goal)
+
+    open_set = [(h[start], 0, start)] # (f_score, g_score, cell)
+    came_from = {}
+    g_score = {start: 0}
+    pushes = 1
+
+    while open_set:
+        _, current_g, current = heapq.heappop(open_set)
+        # Check if we reached the goal
+        if current == goal or (goal is None and h[current] == 0):
+            path = []
+            while current in came_from:
+                path.append(current)
+                current = came_from[current]
+            path.append(start)
+            if turn_stats is not None:
+                turn_stats.add_astar(pushes)
+            return path[::-1]
+
+        tentative_g_score = current_g + 1
+        for neighbor in neighbors[current]:
+            if cells[neighbor]:
+                continue
+            if tentative_g_score < g_score.get(neighbor, INFINITY):
+                came_from[neighbor] = current
+                g_score[neighbor] = tentative_g_score
+                heapq.heappush(open_set, (tentative_g_score + h[neighbor], tentative_g_score, neighbor))
+                pushes += 1
+
+    if turn_stats is not None:
+        turn_stats.add_astar(pushes)
+    return None # No path found
+
+class GoalDistance:
+    """grid.distance() to one cell (Manhattan or hex), indexed like grid.edge_distance but computed on demand."""
+    __slots__ = ("distance", "goal")
+
+    def __init__(self, grid, goal):
+        self.distance = grid.distance
+        self.goal = goal
+
+    def __getitem__(self, i):
+        return self.distance(i, self.goal)
+
+def evaluate_board(cat, board):
+    """Evaluation function for Minimax. Always evaluates path to edge."""
+    if board.grid.is_edge[cat]:
+        return 1000
+
+    path = a_star_search(cat, board) # Explicitly path to edge
+    if path is None:
+        return -1000
+
+    return -len(path)
+
+def minimax(depth, is_maximizing, cat, field, alpha, beta, search=None, can_attack=False):
+    """
+    Minimax algorithm with alpha-beta pruning.
+    field is an EdgeDistanceField the caller owns: player blocks are tried
+    with field.block() and taken back with field.undo(), and every
+    evaluation is a lookup in it. The optional SearchContext counts nodes,
+    enforces the deadline and provides the TranspositionTable, keyed by
+    the board's Zobrist hash.
+    With can_attack, the cat still has its one attack: on its turn it may
+    also break an adjacent block (field.unblock()) and then step into the
+    gap or to any free neighbour, the same (attack, move) pairs the root
+    searches (root_options()), and a walled-in cat is not lost yet.
+    With TRAP_CUT_CHECK, a player node two or more plies from the leaves
+    whose minimum cut (trap_cut.py) is a single tile is a loss for the cat
+    without searching it: the player blocks that tile, however far from
+    the cat it is. can_trap_in_one() tries the cheap two_ways_out() test
+    before the flow.
+    Moves are tried in order_moves() order, and with PVS every move after
+    the first is searched with a null window first (search_child()). The
+    value is the same either way, only the number of nodes changes.
+    """
+    table = None
+    if search is not None:
+        search.nodes += 1
+        if search.deadline is not None and not search.nodes & 1023 and time.perf_counter() > search.deadline:
+            raise SearchTimeout()
+        table = search.table
+
+    dist = field.dist
+    hint = None
+    if table is not None:
+        zobrist = field.grid.zobrist
+        key = field.board.hash ^ zobrist.cat[cat]
+        if is_maximizing:
+            key ^= zobrist.cat_to_move
+        if can_attack:
+            key ^= zobrist.attack_available
+        cached = table.probe(key, depth, alpha, beta)
+        if cached is not None:
+            return cached
+        hint = table.best_move(key) # Best move from an earlier (shallower) search
+
+    # Same values as evaluate_board(): +1000 at the edge, -1000 with no path out
+    static = field.evaluate(cat)
+    if static == 1000 or (static == -1000 and not can_attack):
+        return static
+    # Only where it can spare a subtree: below depth 2 the player's blocks lead straight to leaves
+    if (TRAP_CUT_CHECK and depth > 1 and not is_maximizing and not can_attack
+            and can_trap_in_one(cat, field.board, dist)):
+        return -1000 # The player closes the last gap next
+    if depth == 0:
+        return static
+
+    cells = field.board.cells
+    neighbors = field.grid.neighbors
+    alpha_orig, beta_orig = alpha, beta
+    best = None
+    if is_maximizing: # Cat's turn
+        max_eval = -math.inf
+        # Closest to the edge first, so alpha-beta cuts off sooner
+        moves = order_moves([n for n in neighbors[cat] if not cells[n]], dist, hint)
+        for i, move in enumerate(moves):
+            evaluation = search_child(depth - 1, False, move, field, alpha, beta, search, can_attack, i > 0)
+            if evaluation > max_eval:
+                max_eval = evaluation
+                best = move
+            alpha = max(alpha, evaluation)
+            if beta <= alpha:
+                if search is not None:
+                    search.cutoffs += 1
+                break
+        else:
+            # Then the attack (used up once taken): break an adjacent block, then step through the gap
+            # or to a free neighbour, the same (attack, move) pairs as root_options()
+            if can_attack:
+                for attack in [n for n in neighbors[cat] if cells[n]]:
+                    field.unblock(attack)
+                    try:
+                        moves = [n for n in neighbors[cat] if not cells[n]]
+                        moves.sort(key=lambda n: (n != attack, dist[n])) # The gap first
+                        for move in moves:
+                            evaluation = search_child(depth - 1, False, move, field, alpha, beta, search, False,
+                                                      best is not None)
+                            if evaluation > max_eval:
+                                max_eval = evaluation
+                                best = (attack, move)
+                            alpha = max(alpha, evaluation)
+                            if beta <= alpha:
+                                break
+                    finally:
+                        field.undo()
+                    if beta <= alpha:
+                        if search is not None:
+                            search.cutoffs += 1
+                        break
+        value = max_eval if max_eval != -math.inf else static
+    else: # Player's turn
+        min_eval = math.inf
+        # The cat's next steps out and tiles further along its ways out, not just its neighbours
+        possible_blocks = block_candidates(cat, field, PLAYER_BEAM_WIDTH, PLAYER_LOOKAHEAD, can_attack)
+        # Blocks on the cat's shortest way out (one step closer to the edge) first
+        possible_blocks = order_moves(possible_blocks, dist, hint)
+
+        for i, block in enumerate(possible_blocks):
+            field.block(block)
+            try:
+                evaluation = search_child(depth - 1, True, cat, field, alpha, beta, search, can_attack, i > 0)
+            finally:
+                field.undo()
+            if evaluation < min_eval:
+                min_eval = evaluation
+                best = block
+            beta = min(beta, evaluation)
+            if beta <= alpha:
+                if search is not None:
+                    search.cutoffs += 1
+                break
+        value = min_eval if min_eval != math.inf else static
+
+    if table is not None:
+        table.store(key, depth, value, alpha_orig, beta_orig, best)
+    return value
+
+def order_moves(moves, dist, hint):
+    """
+    Search order of a node's moves (cells): the transposition table's
+    best move first, then by edge distance, the cells closest to the edge
+    first. For the cat that is the most promising move; for the player it
+    is a block on the cat's shortest way out.
+    """
+    moves.sort(key=dist.__getitem__)
+    if hint in moves:
+        moves.remove(hint)
+        moves.insert(0, hint)
+    return moves
+
+def search_child(depth, is_maximizing, cat, field, alpha, beta, search, can_attack, null_window):
+    """
+    minimax() of a child node. With PVS and null_window (any move after
+    the first) the child only has to show it is no better than the best
+    move so far: it is searched with a one-point window at alpha (or beta
+    below a player node), which cuts off much sooner. Only a child that
+    turns out better gets the full window. Scores are integers, so the
+    result is the same as a full-window search.
+    """
+    if PVS and null_window:
+        if is_maximizing:
+            if beta != math.inf: # The player is choosing
+                value = minimax(depth, True, cat, field, beta - 1, beta, search, can_attack)
+                if not alpha < value < beta:
+                    return value
+        elif alpha != -math.inf: # The cat is choosing
+            value = minimax(depth, False, cat, field, alpha, alpha + 1, search, can_attack)
+            if not alpha < value < beta:
+                return value
+    return minimax(depth, is_maximizing, cat, field, alpha, beta, search, can_attack)
+
+# --- AI Decision Making ---
+def root_options(cat, board, can_attack):
+    """The cat's choices as (attack, move) pairs: plain moves (attack None) first, then attacks."""
+    neighbors = board.grid.neighbors
+    cells = board.cells
+    options = [(None, move) for move in neighbors[cat] if not cells[move]]
+    if can_attack:
+        for attack in neighbors[cat]:
+            if cells[attack]:
+                options += [(attack, move) for move in neighbors[cat] if move == attack or not cells[move]]
+    return options
+
+def search_option(option, depth, field, alpha, beta, search):
+    """Minimax value of one root option; an attack's block is broken for the search and restored after."""
+    attack, move = option
+    if attack is None:
+        return minimax(depth, False, move, field, alpha, beta, search, search.can_attack)
+    field.unblock(attack)
+    try:
+        return minimax(depth, False, move, field, alpha, beta, search) # The attack is used up
+    finally:
+        field.undo()
+
+def best_options(scores):
+    """
+    The tied best of {option: score}. An attack is only chosen when it
+    beats every plain move, so the cat does not waste it.
+    """
+    plain = {option: score for option, score in scores.items() if option[0] is None}
+    attacks = {option: score for option, score in scores.items() if option[0] is not None}
+    best_plain = max(plain.values(), default=-1000) # A walled-in cat only attacks if that gets it out
+    best_attack = max(attacks.values(), default=-math.inf)
+    if best_attack > best_plain:
+        return best_attack, [option for option, score in attacks.items() if score == best_attack]
+    return best_plain, [option for option, score in plain.items() if score == best_plain]
+
+def search_root(cat, field, depth, search):
+    """
+    Scores every cat option at the given depth. Returns (best score, tied
+    best (attack, move) options). With PVS the options closest to the edge
+    are searched first and the others with a window starting one point
+    below the best score so far: worse options fail low early, and options
+    that tie still get their exact score.
+    """
+    options = root_options(cat, field.board, search.can_attack)
+    scores = dict.fromkeys(options) # best_options() breaks ties in this order
+    if PVS:
+        dist = field.dist
+        options.sort(key=lambda option: (option[0] is not None, dist[option[1]]))
+    best_plain = -math.inf
+    best_attack = -math.inf
+    for option in options:
+        if option[0] is None:
+            alpha = best_plain - 1 if PVS else -math.inf
+            score = search_option(option, depth, field, alpha, math.inf, search)
+            best_plain = max(best_plain, score)
+        else:
+            # An attack only matters if it beats every plain move, so anything up to that fails low early
+            alpha = max(best_plain, best_attack - 1) if PVS else best_plain
+            score = search_option(option, depth, field, alpha, math.inf, search)
+            best_attack = max(best_attack, score)
+        scores[option] = score
+    return best_options(scores)
+
+def find_best_move(state):
+    """
+    Determines the cat's best move using Minimax, returning (move, score, attack):
+    attack is the adjacent block to break before moving, or None. The cat
+    only considers attacking while it still has its attack, at the root
+    and anywhere deeper in the tree.
+    With SEARCH_TIME_BUDGET_MS set, it deepens one ply at a time until the
+    budget runs out and keeps the result of the deepest finished iteration.
+    Each iteration orders moves by the best moves the previous one stored
+    in the transposition table. The SearchInfo is kept in state.last_search.
+    With USE_TABLEBASE, a position the tablebase has solved is played from
+    it without searching.
+    """
+    start = time.perf_counter()
+    grid = state.grid
+    cat = grid.index(state.cat_pos)
+    info = SearchInfo()
+    state.last_search = info
+
+    solved = probe_tablebase(cat, state.blocked) if USE_TABLEBASE else None
+    if solved is not None:
+        info.tablebase, move = solved
+        info.score = 1000
+        info.best_moves = [(None, move)]
+        info.elapsed_ms = (time.perf_counter() - start) * 1000
+        return grid.cell(move), 1000, None
+
+    field = EdgeDistanceField(state.blocked.copy()) # Minimax blocks and unblocks cells on this copy
+    table = state.transpositions
+    search = SearchContext(table)
+    search.can_attack = not state.cat_has_attacked_in_game
+    hits, misses = table.hits, table.misses
+
+    if SEARCH_TIME_BUDGET_MS is None:
+        depths = [MINIMAX_DEPTH]
+    else:
+        depths = range(1, MAX_SEARCH_DEPTH + 1)
+    if PARALLEL_ROOT_WORKERS:
+        from parallel_search import parallel_search_root as root_search # Only load the pool when used
+    else:
+        root_search = search_root
+
+    for depth in depths:
+        try:
+            score, moves = root_search(cat, field, depth, search)
+        except SearchTimeout:
+            info.timed_out = True
+            break
+        info.depth, info.score, info.best_moves = depth, score, moves
+        if not moves or score == 1000 or (score == -1000 and not search.can_attack):
+            break # Escape or capture is already certain, deeper searches agree
+        # The first iteration always finishes so there is a move to play
+        if SEARCH_TIME_BUDGET_MS is not None:
+            search.deadline = start + SEARCH_TIME_BUDGET_MS / 1000
+
+    info.nodes = search.nodes
+    info.cutoffs = search.cutoffs
+    info.tt_hits, info.tt_misses = table.hits - hits, table.misses - misses
+    info.elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if info.best_moves:
+        attack, move = tie_break_rng(state).choice(info.best_moves)
+        return grid.cell(move), info.score, grid.cell(attack) if attack is not None else None
+
+    # Fallback if no moves are found
+    return None, -1000, None
+
+def tie_break_rng(state):
+    """
+    The RNG that picks among equally good moves. A seeded game draws from
+    its seed and turn number only, so a recorded turn can be replayed on
+    its own, whatever searches ran before it.
+    """
+    if state.seed is None:
+        return random
+    return random.Random(f"{state.seed}:{state.turn}")
+
+def probe_tablebase(cat, board):
+    """(moves to the edge, first move) if the tablebase has solved the position as a forced escape, else None."""
+    tablebase = tablebase_for(board.grid)
+    return tablebase.probe(cat, board) if tablebase is not None else None
+
+# --- Bait Analysis ---
+# Results of analyze_bait() by (topology, cat, bait, blocked cells); a board only ever gives one answer
+BAIT_CACHE_SIZE = 4096
+bait_cache = {}
+
+class BaitAnalysis:
+    """What the cat thinks of the bait: trap verdict, opportunity score and first step towards it."""
+
+    def __init__(self, is_trap, score, next_step):
+        self.is_trap = is_trap     # True if the bait appears dangerous (likely to trap the cat)
+        self.score = score         # Higher = better opportunity, -1000 = unreachable, no info or a trap
+        self.next_step = next_step # Cell index of the first step on the path to the bait, or None
+
+    def __repr__(self):
+        return f"BaitAnalysis(is_trap={self.is_trap}, score={self.score}, next_step={self.next_step})"
+
+def compute_bait_analysis(cat, bait, board):
+    """
+    Walks the path to the bait once. At every step it looks for the way
+    out, lets a "smart" player block the first tile of it and checks
+    whether the cat could still escape. A step without a way out (before
+    or after that block) is a risk: the first one makes the bait a trap
+    and ends the walk, since a trap is never scored. A safe path is scored
+    by its length.
+    """
+    path = a_star_search(cat, board, goal=bait)
+    if not path or len(path) < 2:
+        return BaitAnalysis(False, -1000, None) # No path or already on bait – not enough info
+
+    for step in path[1:]: # Skip current position
+        escape_path = a_star_search(step, board)
+        if not escape_path or len(escape_path) < 2:
+            return BaitAnalysis(True, -1000, path[1]) # Already trapped
+
+        # Simulate a "smart" player blocking the cat's next move, then recheck escape options
+        dangerous_block = escape_path[1]
+        board.block(dangerous_block)
+        escape_after = a_star_search(step, board)
+        board.unblock(dangerous_block)
+        if not escape_after:
+            return BaitAnalysis(True, -1000, path[1]) # No way out after bait step
+
+    # Every step was safe: 10 per step, minus the path length so short paths come first
+    steps = len(path) - 1
+    return BaitAnalysis(False, steps * 10 - len(path), path[1])
+
+def analyze_bait(cat, bait, board):
+    """compute_bait_analysis(), memoized on the position."""
+    key = (board.grid.topology, cat, bait, bytes(board.cells))
+    analysis = bait_cache.get(key)
+    if analysis is None:
+        analysis = compute_bait_analysis(cat, bait, board)
+        if len(bait_cache) >= BAIT_CACHE_SIZE:
+            del bait_cache[next(iter(bait_cache))] # Oldest first
+        bait_cache[key] = analysis
+    return analysis
+
+def bait_is_a_trap(cat, bait, board):
+    """True if the bait appears dangerous (likely to trap the cat), else False."""
+    return analyze_bait(cat, bait, board).is_trap
+
+def score_bait_path(cat, bait, board):
+    """How safe/smart it is to go for the bait. Higher score = better opportunity, -1000 = a trap or unreachable."""
+    return analyze_bait(cat, bait, board).score
+
+
+# --- Cat Turn ---
+def plan_cat_turn(state):
+    """
+    Decides what the cat does this turn without changing the game
+    (only state.last_search and state.last_stats are updated). Returns a
+    CatDecision; apply_cat_turn() (or the individual rule functions below)
+    carries it out.
+    """
+    global turn_stats
+    stats = turn_stats = TurnStats() if COLLECT_STATS else None
+    try:
+        decision = choose_cat_action(state, stats)
+    finally:
+        turn_stats = None
+    state.last_stats = stats
+    return decision
+
+# The body of plan_cat_turn(); stats is its TurnStats, or None when COLLECT_STATS is off
+def choose_cat_action(state, stats):
+    board = state.blocked.copy() # Scratch board for the what-if checks below
+    grid = board.grid
+    cat = grid.index(state.cat_pos)
+    ignore_bait = False
+
+    # --- 0. Evaluate bait (trap check + scoring) ---
+    bait_score = None
+    future_pos = None
+    if state.bait and not state.cat_ignored_bait:
+        with phase(stats, "bait"):
+            bait = analyze_bait(cat, grid.index(state.bait), board)
+        # Step 1: Check if bait is a definite trap
+        if bait.is_trap:
+            ignore_bait = True
+        else:
+            # Step 2: Score the bait opportunity
+            bait_score = bait.score
+            if bait_score > -1000:
+                future_pos = grid.cell(bait.next_step)
+
+    # --- 1. Find the best move (and whether to attack first) using Minimax ---
+    with phase(stats, "minimax"):
+        best_move, best_move_score, attack = find_best_move(state)
+    if stats is not None:
+        stats.add_search(state.last_search)
+
+    # --- 2. Choose the best option ---
+    decision = CatDecision(best_move, "regular", ignore_bait=ignore_bait)
+    if attack is not None:
+        decision.attack = attack
+        decision.reason = "attack_then_move"
+
+    if bait_score is not None and bait_score > best_move_score and future_pos:
+        decision.move = future_pos
+        decision.attack = None
+        decision.reason = "bait"
+
+    return decision
+
+def attack_block(state, cell):
+    """The cat breaks an adjacent block (once per game)."""
+    state.blocked.remove(cell)
+    state.cat_attacked_this_turn = True
+    state.cat_has_attacked_in_game = True
+
+def move_cat(state, cell):
+    """Moves the cat, eats the bait if it is there and checks the win condition.
+    Returns True if the bait was eaten."""
+    state.cat_pos = cell
+    ate_bait = False
+    if state.bait and state.cat_pos == state.bait:
+        state.bait = None
+        ate_bait = True
+    if is_at_edge(state.cat_pos, state.grid):
+        state.game_over = True
+        state.winner = 'cat'
+    return ate_bait
+
+def trap_cat(state):
+    """Ends the game in the player's favour when the cat has no move left."""
+    state.game_over = True
+    state.winner = 'player'
+
+def apply_cat_turn(state, decision):
+    """Carries out a CatDecision in one go (used when nothing needs animating)."""
+    state.cat_attacked_this_turn = False
+    if decision.ignore_bait:
+        state.cat_ignored_bait = True
+    if decision.attack:
+        attack_block(state, decision.attack)
+    if decision.move:
+        move_cat(state, decision.move)
+    else:
+        trap_cat(state)
+
+def cat_turn(state):
+    """Plans and plays one full cat turn headlessly. Returns the CatDecision."""
+    decision = plan_cat_turn(state)
+    apply_cat_turn(state, decision)
+    return decision
+
+
+# --- Player Actions ---
+def can_place(state, cell):
+    """True if the player may put a block or the bait on this tile."""
+    return cell is not None and cell != state.cat_pos and cell not in state.blocked and cell != state.bait
+
+def place_block(state, cell):
+    state.blocked.add(cell)
+    state.turn += 1
+
+def place_bait(state, cell):
+    state.bait = cell
+    state.bait_used = True
+    state.turn += 1
+
+
+# --- Reset Game Function ---
+# Resets the game state to start a new game
+def reset_game(state, rng=random):
+    size = state.grid.size
+    state.__init__(size, state.grid.topology)
+
+    # Randomly place the starting blocked tiles, ensuring they are not on the cat's position
+    while len(state.blocked) < INITIAL_BLOCKS * size * size // (11 * 11):
+        r = rng.randint(0, size - 1)
+        c = rng.randint(0, size - 1)
+        cell = (r, c)
+        if cell != state.cat_pos and cell not in state.blocked:
+            state.blocked.add(cell)
+    return state
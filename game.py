@@ -1,18 +1,44 @@
+import time
+STARTED_AT = time.perf_counter() # Time to first frame is measured from here, before pygame loads
 import pygame
-import random
 import sys
 import os
-import heapq
-import math
+import random
+
+import engine
+from ai_worker import AIWorker
+from renderer import BoardLayer, DirtyTracker, TextCache, FrameTimer, make_circle_sprite
+from instrumentation import Profiler
+from animation import Animation, AnimationScheduler
+from trap_cut import min_cut
+import hint
+import recording
+from asset_manager import AssetManager
 
 # --- Basic Settings ---
-GRID_SIZE = 11 # Odd number is best for a central start
-CELL_RADIUS = 30
-MARGIN = 8
-WIDTH = GRID_SIZE * (CELL_RADIUS * 2 + MARGIN) + MARGIN
-HEIGHT = WIDTH + 60  # Add 60 pixels at the top for HUD
+BOARD_SIZE = engine.GRID_SIZE # One of engine.BOARD_SIZES: 11, 21, 31 or 51
+BOARD_TOPOLOGY = engine.BOARD_TOPOLOGY # "square" or "hex"
+HEX = BOARD_TOPOLOGY == "hex"
+BOARD_PIXELS = 756 # The board's width in pixels; cells shrink to fit bigger boards
+MARGIN = max(1, 8 * 11 // BOARD_SIZE) # 8 pixels between cells on the 11x11 board
+# Hex boards are half a cell wider (odd rows are shifted right)
+CELL_RADIUS = ((BOARD_PIXELS - MARGIN) * 2 // (BOARD_SIZE * 2 + HEX) - MARGIN) // 2 # 30 on the 11x11 square board
+CELL_PITCH = CELL_RADIUS * 2 + MARGIN # Cell center to cell center
+# Hex rows are packed closer together, so diagonal neighbours are as far apart as side ones
+ROW_PITCH = CELL_PITCH * 87 // 100 if HEX else CELL_PITCH
+WIDTH = BOARD_SIZE * CELL_PITCH + MARGIN + (CELL_PITCH // 2 if HEX else 0)
+HEIGHT = (BOARD_SIZE - 1) * ROW_PITCH + CELL_PITCH + MARGIN + 60  # Add 60 pixels at the top for HUD
 FPS = 30
-MINIMAX_DEPTH = 3 # Adjust for difficulty/performance. 2-3 is a good balance.
+AI_TIME_BUDGET_MS = 200 # The cat thinks at most this long per turn (iterative deepening)
+AI_WORKER_MODE = "thread" # "thread" or "process": where the cat's search runs
+CAT_MOVE_DELAY_MS = 100 # Short pause before the cat acts, even if it decided faster
+ANIMATION_SPEED = 1.0 # 2.0 plays animations twice as fast; Space skips the current ones
+ANIMATIONS_ENABLED = True # False applies moves instantly (headless-style)
+PROFILE_AI_PATH = None # e.g. "cat_ai.prof": cProfile every cat turn of the session into this pstats file
+ASSET_ATLAS_PATH = ".cache/sprites.atlas" # Pre-scaled images saved at exit for a faster start; None to decode the PNGs
+RECORDINGS_DIR = ".cache/recordings" # Every game is saved here for recording.py to replay; None to not save them
+
+engine.SEARCH_TIME_BUDGET_MS = AI_TIME_BUDGET_MS
 
 # --- Colors (Sand/Cream Palette) ---
 TILE_COLOR = (240, 225, 200)
@@ -29,71 +55,43 @@ screen = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption("Trap The Cat - AI Version")
 clock = pygame.time.Clock()
 font = pygame.font.Font("assets/font/game-quotes.otf", 36)
+debug_font = pygame.font.Font(None, 22)
 
-# --- Load Assets ---
-grass_bg = pygame.image.load("assets/images/grass.png").convert()
-grass_bg = pygame.transform.scale(grass_bg, (WIDTH, HEIGHT))
-cat_logo = pygame.image.load("assets/images/cat_logo.png").convert_alpha()
-cat_logo = pygame.transform.scale(cat_logo, (50, 50))  
-cat_laugh_image = pygame.image.load("assets/images/cat_win.png").convert_alpha()
-cat_laugh_image = pygame.transform.scale(cat_laugh_image, (200, 200))  # אתה יכול לשנות את הגודל
-cat_sad_image = pygame.image.load("assets/images/cat_lose.png").convert_alpha()
-cat_sad_image = pygame.transform.scale(cat_sad_image, (200, 200))  # אתה יכול לשנות את הגודל
-# --- Asset Loading ---
-def load_sound(filename):
-    path = os.path.join("assets/sounds", filename)
-    if os.path.exists(path):
-        return pygame.mixer.Sound(path)
-    return None
+# --- Assets ---
+# Loaded on first use (asset_manager.py): the first frame only waits for the grass, the logo and the idle cat
+assets = AssetManager(ASSET_ATLAS_PATH)
+CAT_SPRITES = "assets/sprites/cat"
+CAT_SPRITE_SIZE = (CELL_RADIUS * 2, CELL_RADIUS * 2)
+MOUSE_SPRITE_SIZE = (CELL_RADIUS, CELL_RADIUS)
+
+# A cat sprite series, facing left if flip
+def cat_sprites(name, count, flip=False):
+    return assets.series(os.path.join(CAT_SPRITES, name), count, CAT_SPRITE_SIZE, flip)
+
+def mouse_sprites():
+    return assets.series("assets/sprites/mouse/idle", 4, MOUSE_SPRITE_SIZE)
+
+def cat_logo():
+    return assets.image("assets/images/cat_logo.png", (50, 50))
+
+# The game over pictures, cat_win.png or cat_lose.png
+def game_over_image(name):
+    return assets.image(os.path.join("assets/images", name), (200, 200))
 
-# Load all sounds
-jump_sound = load_sound("cat_jump.wav")
-mouse_dead_sound = load_sound("mouse_dead.wav")
-place_block_sound = load_sound("place_block.wav")
-place_mouse_sound = load_sound("place_mouse.wav")
-cat_attack_sound = load_sound("cat_attack.wav")
-background_music_sound = load_sound("background_music.wav")
-victory_sound = load_sound("victory.wav")
-defeat_sound = load_sound("defeat.wav")
-cat_dead_sound = load_sound("cat_dead.wav")
-
-# Loads a sequence of sprite images from a specific subfolder, optionally scaling them to a given size
-def load_sprite_series(subfolder, count, base_path="assets/sprites/cat", size=None):
-    images = []
-    path_prefix = os.path.join(base_path, subfolder)
-    if not os.path.exists(path_prefix):
-        print(f"Warning: Sprite folder not found at {path_prefix}")
-        return []
-    for i in range(1, count + 1):
-        img_path = os.path.join(path_prefix, f"{subfolder}{i}.png")
-        if os.path.exists(img_path):
-            img = pygame.image.load(img_path).convert_alpha()
-            if size:
-                images.append(pygame.transform.scale(img, size))
-            else:
-                images.append(pygame.transform.scale(img, (CELL_RADIUS * 2, CELL_RADIUS * 2)))
-    return images
-
-# Load all sprite series
-attack_images = load_sprite_series("attack", 4)
-run_images_original = load_sprite_series("run", 6)
-idle_images_original = load_sprite_series("idle", 4)
-dead_images = load_sprite_series("dead", 4)
-mouse_idle_images = load_sprite_series("idle", 4, base_path="assets/sprites/mouse", size=(30, 30))
-
-run_images_flipped = [pygame.transform.flip(img, True, False) for img in run_images_original]
-idle_images_flipped = [pygame.transform.flip(img, True, False) for img in idle_images_original]
-
-# --- Global Game State Variables ---
-blocked = set()
-bait = None
-cat_ignored_bait = False
-cat_pos = (GRID_SIZE // 2, GRID_SIZE // 2)
-game_over = False
-winner = None
-bait_used = False
-cat_attacked_this_turn = False
-cat_has_attacked_in_game = False # New variable to track attack per game
+def sound(filename):
+    return assets.sound(os.path.join("assets/sounds", filename))
+
+# Plays a sound if its file exists
+def play_sound(filename):
+    s = sound(filename)
+    if s:
+        s.play()
+
+# --- Global Game State ---
+state = engine.GameState(BOARD_SIZE, BOARD_TOPOLOGY)
+ai_worker = None # AIWorker, created in main()
+player_turn = True # False from the player's move until the cat has played its turn
+recorder = None # recording.GameRecorder of the game being played: its moves, undo (Ctrl+Z) and redo (Ctrl+Y)
 
 # Animation variables
 cat_idle_index = 0
@@ -105,158 +103,67 @@ dead_final_sprite = None
 # --- Helper Functions ---
 def get_cell_center(cell):
     row, col = cell
-    x = MARGIN + col * (2 * CELL_RADIUS + MARGIN) + CELL_RADIUS
-    y = MARGIN + row * (2 * CELL_RADIUS + MARGIN) + CELL_RADIUS + 60
+    x = MARGIN + col * CELL_PITCH + CELL_RADIUS
+    if HEX and row % 2:
+        x += CELL_PITCH // 2
+    y = MARGIN + row * ROW_PITCH + CELL_RADIUS + 60
     return x, y
 
 # --- Game Logic Functions ---
 def get_cell_from_pos(pos):
     x, y = pos
     if y < 60: return None # Click was in HUD area
-    col = (x - MARGIN) // (2 * CELL_RADIUS + MARGIN)
-    row = (y - 60 - MARGIN) // (2 * CELL_RADIUS + MARGIN)
-    if 0 <= row < GRID_SIZE and 0 <= col < GRID_SIZE:
+    row = (y - 60 - MARGIN) // ROW_PITCH
+    if HEX and row % 2:
+        x -= CELL_PITCH // 2
+    col = (x - MARGIN) // CELL_PITCH
+    if 0 <= row < BOARD_SIZE and 0 <= col < BOARD_SIZE:
         return (row, col)
     return None
 
-# Returns the neighbors of a cell, ensuring they are within bounds
-def get_neighbors(pos):
-    r, c = pos
-    directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]  # Up, Down, Left, Right
-    return [(r + dr, c + dc) for dr, dc in directions if 0 <= r + dr < GRID_SIZE and 0 <= c + dc < GRID_SIZE]
-
-
-# --- Edge Of Grid Detection ---
-def is_at_edge(pos):
-    r, c = pos
-    return r == 0 or r == GRID_SIZE - 1 or c == 0 or c == GRID_SIZE - 1
-
-# --- AI ALGORITHMS (A* and Minimax) ---
-
-def a_star_search(start_pos, current_blocked, goal_pos=None):
-    """
-    Finds the shortest path using A*.
-    If goal_pos is provided, it paths to that specific tile.
-    If goal_pos is None, it paths to the nearest edge.
-    """
-    def h(pos):
-        if goal_pos:
-            # Manhattan distance to a specific goal tile
-            return abs(pos[0] - goal_pos[0]) + abs(pos[1] - goal_pos[1])
-        else:
-            # Manhattan distance to the closest edge
-            return min(pos[0], GRID_SIZE - 1 - pos[0], pos[1], GRID_SIZE - 1 - pos[1])
-
-    if goal_pos is None and is_at_edge(start_pos):
-        return [start_pos]
-
-    open_set = [(h(start_pos), 0, start_pos)] # (f_score, g_score, pos)
-    came_from = {}
-    g_score = { (r,c): float('inf') for r in range(GRID_SIZE) for c in range(GRID_SIZE) }
-    g_score[start_pos] = 0
-
-    while open_set:
-        _, current_g, current_pos = heapq.heappop(open_set)
-        # Check if we reached the goal
-        is_at_goal = (goal_pos and current_pos == goal_pos) or (goal_pos is None and is_at_edge(current_pos))
-        if is_at_goal:
-            path = []
-            while current_pos in came_from:
-                path.append(current_pos)
-                current_pos = came_from[current_pos]
-            path.append(start_pos)
-            return path[::-1]
-
-        for neighbor in get_neighbors(current_pos):
-            if neighbor in current_blocked:
-                continue
-            # Calculate tentative g_score
-            tentative_g_score = current_g + 1
-            if tentative_g_score < g_score[neighbor]:
-                came_from[neighbor] = current_pos
-                g_score[neighbor] = tentative_g_score
-                f_score = tentative_g_score + h(neighbor)
-                heapq.heappush(open_set, (f_score, tentative_g_score, neighbor))
-    
-    return None # No path found
-
-def evaluate_board(current_cat_pos, current_blocked):
-    """Evaluation function for Minimax. Always evaluates path to edge."""
-    if is_at_edge(current_cat_pos):
-        return 1000
-    
-    path = a_star_search(current_cat_pos, current_blocked, goal_pos=None) # Explicitly path to edge
-    if path is None:
-        return -1000
-    
-    return -len(path)
-
-def minimax(depth, is_maximizing, cat_p, blocked_s, alpha, beta):
-    """Minimax algorithm with alpha-beta pruning."""
-    if depth == 0 or is_at_edge(cat_p) or a_star_search(cat_p, blocked_s, goal_pos=None) is None:
-        return evaluate_board(cat_p, blocked_s)
-
-    if is_maximizing: # Cat's turn
-        max_eval = -math.inf
-        for move in get_neighbors(cat_p):
-            if move not in blocked_s:
-                evaluation = minimax(depth - 1, False, move, blocked_s, alpha, beta)
-                max_eval = max(max_eval, evaluation)
-                alpha = max(alpha, evaluation)
-                if beta <= alpha:
-                    break
-        return max_eval
-    else: # Player's turn
-        min_eval = math.inf
-        possible_blocks = [n for n in get_neighbors(cat_p) if n not in blocked_s]
-        if not possible_blocks:
-             possible_blocks = [n for n in get_neighbors(get_neighbors(cat_p)[0]) if n not in blocked_s] if get_neighbors(cat_p) else []
-
-        for block_pos in possible_blocks:
-            new_blocked = blocked_s.copy()
-            new_blocked.add(block_pos)
-            evaluation = minimax(depth - 1, True, cat_p, new_blocked, alpha, beta)
-            min_eval = min(min_eval, evaluation)
-            beta = min(beta, evaluation)
-            if beta <= alpha:
-                break
-        return min_eval if min_eval != math.inf else evaluate_board(cat_p, blocked_s)
-
-# --- AI Decision Making ---
-def find_best_move():
-    """Determines the cat's best move using Minimax, returning the move and its score."""
-    best_score = -math.inf
-    best_moves = []
-    
-    for move in get_neighbors(cat_pos):
-        if move not in blocked:
-            score = minimax(MINIMAX_DEPTH, False, move, blocked, -math.inf, math.inf)
-            if score > best_score:
-                best_score = score
-                best_moves = [move]
-            elif score == best_score:
-                best_moves.append(move)
-    
-    if best_moves:
-        return random.choice(best_moves), best_score
-    
-    # Fallback if no moves are found
-    return None, -1000
-
+# --- Cached Layers ---
+# Grass and tiles are pre-rendered once; only tiles that change are redrawn
+board_layer = BoardLayer(assets.image("assets/images/grass.png", (WIDTH, HEIGHT), alpha=False),
+                         [get_cell_center(state.grid.cell(i)) for i in range(state.grid.cells)],
+                         CELL_RADIUS, TILE_COLOR, BLOCKED_COLOR)
+text_cache = TextCache(font)
+circle_sprites = {} # (color, radius) -> pre-rendered circle
+game_over_overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+game_over_overlay.fill((0, 0, 0, 150))
+frame_timer = FrameTimer()
+show_frame_time = False # Toggled with F3
+shown_frame_ms = 0.0 # Frame time on screen, refreshed every 250 ms so F3 does not repaint its corner every frame
+last_frame_time_update = 0
+first_frame_ms = None # Time from startup until the first frame was on screen, shown with the frame time
+show_ai_stats = False # Toggled with F4, collects engine stats while on
+show_trap_hint = False # Toggled with H: how many blocks still trap the cat, and where
+trap_hint = None # ((cat, board hash), TrapCut) of the last position the hint was computed for
+TRAP_HINT_COLOR = (240, 120, 20)
+show_block_hint = False # Toggled with S: the block the hint engine suggests (hint.py)
+block_hint = None # hint.BlockHint, ranked in the background as soon as it is the player's turn
+BLOCK_HINT_COLOR = (40, 150, 70)
+trap_hint_panel = pygame.Surface((170, 30), pygame.SRCALPHA)
+trap_hint_panel.fill((0, 0, 0, 160))
+debug_text_cache = TextCache(debug_font)
+ai_stats_panel = pygame.Surface((240, 170), pygame.SRCALPHA)
+ai_stats_panel.fill((0, 0, 0, 160))
+dirty = DirtyTracker(screen.get_rect()) # Only changed areas are pushed to the display
+animations = AnimationScheduler(ANIMATION_SPEED, headless=not ANIMATIONS_ENABLED)
+screen_flash = pygame.Surface((WIDTH, HEIGHT))
+screen_flash.fill((255, 255, 255))
+screen_flash.set_alpha(100)
+fade_sprites = {} # alpha -> red circle used when an attacked tile fades out
+HUD_RECT = pygame.Rect(0, 0, WIDTH, 60)
+FRAME_TIME_RECT = pygame.Rect(0, HEIGHT - 70, WIDTH, 70)
+AI_STATS_RECT = ai_stats_panel.get_rect(topleft=(0, 60))
+TRAP_HINT_RECT = trap_hint_panel.get_rect(bottomright=(WIDTH, HEIGHT))
 
 # --- Drawing and Animation ---
 
-def draw_circle_with_shadow(color, pos, radius, shadow_offset=(3, 3)):
-    shadow_color = (0, 0, 0, 50)
-    surf = pygame.Surface((radius*2+shadow_offset[0], radius*2+shadow_offset[1]), pygame.SRCALPHA)
-
-    # shadow
-    pygame.draw.circle(surf, shadow_color, (radius + shadow_offset[0], radius + shadow_offset[1]), radius)
-
-    # main circle
-    tile_color = color + (230,)  
-    pygame.draw.circle(surf, tile_color, (radius, radius), radius)
-
+def draw_circle_with_shadow(color, pos, radius):
+    surf = circle_sprites.get((color, radius))
+    if surf is None:
+        surf = circle_sprites[(color, radius)] = make_circle_sprite(color, radius)
     screen.blit(surf, (pos[0]-radius, pos[1]-radius))
 
 
@@ -264,133 +171,256 @@ def draw_circle_with_shadow(color, pos, radius, shadow_offset=(3, 3)):
 def draw_hud():
     pygame.draw.rect(screen, (100, 85, 70), (0, 0, WIDTH, 60))
     
-    bait_text = "Bait: Used" if bait_used else "Bait: Available"
-    attack_text = "Attack: Used" if cat_has_attacked_in_game else "Attack: Available"
+    bait_text = "Bait: Used" if state.bait_used else "Bait: Available"
+    attack_text = "Attack: Used" if state.cat_has_attacked_in_game else "Attack: Available"
 
-    bait_surf = font.render(bait_text, True, (220, 220, 220))    
-    attack_surf = font.render(attack_text, True, (200, 40, 40))  
+    bait_surf = text_cache.render(bait_text, (220, 220, 220))
+    attack_surf = text_cache.render(attack_text, (200, 40, 40))
 
     # Draw bait and attack status
     screen.blit(bait_surf, (20, 15))
     screen.blit(attack_surf, (WIDTH - attack_surf.get_width() - 20, 15))
 
     # Draw cat logo
-    if cat_logo:  
-        logo_x = (WIDTH - cat_logo.get_width()) // 2
-        logo_y = (60 - cat_logo.get_height()) // 2
-        screen.blit(cat_logo, (logo_x, logo_y))
-
-
-
-# Animates a sprite series at a given position with a delay between frames
-def animate_sprite(images, pos, delay=150):
-    for img in images:
-        draw_board(draw_cat=False)
+    logo = cat_logo()
+    if logo:
+        logo_x = (WIDTH - logo.get_width()) // 2
+        logo_y = (60 - logo.get_height()) // 2
+        screen.blit(logo, (logo_x, logo_y))
+
+        # Animated dots next to the logo while the cat is thinking
+        dots = thinking_dots()
+        if dots:
+            dots_surf = text_cache.render(dots, (220, 220, 220))
+            screen.blit(dots_surf, (logo_x + logo.get_width() + 6, 15))
+
+
+# Returns the dots shown while the cat is thinking, "" when it is not
+def thinking_dots():
+    if ai_worker and ai_worker.busy:
+        return "." * (1 + (pygame.time.get_ticks() // 300) % 3)
+    return ""
+
+
+# --- Animations ---
+# Each returns an Animation for the scheduler; on_finish applies what it showed
+
+def cell_rect(cell):
+    x, y = get_cell_center(cell)
+    return pygame.Rect(x - CELL_RADIUS, y - CELL_RADIUS, CELL_RADIUS * 2 + 3, CELL_RADIUS * 2 + 3)
+
+# Plays a sprite series at a given position, delay ms per frame
+def sprite_animation(images, cell, delay=150, on_start=None, on_finish=None):
+    pos = get_cell_center(cell)
+    def draw(anim):
+        img = images[anim.frame]
         screen.blit(img, img.get_rect(center=pos))
-        pygame.display.flip()
-        pygame.time.delay(delay)
+    return Animation([delay] * len(images), draw, on_start, on_finish, rect=cell_rect(cell))
 
-# Animates the cat moving from start to end position, flipping images if needed
-def animate_cat_move(start, end):
-    global cat_facing_left
+# The cat running from start to end position, flipping images if needed
+def cat_move_animation(start, end, on_start=None, on_finish=None):
     sx, sy = get_cell_center(start)
     ex, ey = get_cell_center(end)
-    
-    dx = end[1] - start[1]
-    if dx != 0:
-        cat_facing_left = dx < 0
 
-    # Determine which run images to use based on direction
-    run_images = run_images_flipped if cat_facing_left else run_images_original
-    if not run_images: return
+    def begin():
+        global cat_facing_left
+        dx = end[1] - start[1]
+        if dx != 0:
+            cat_facing_left = dx < 0
+        if on_start:
+            on_start()
 
-    # Animate the cat running from start to end
-    for i in range(len(run_images)):
-        draw_board(draw_cat=False)
-        ix = sx + (ex - sx) * i // len(run_images)
-        iy = sy + (ey - sy) * i // len(run_images)
-        screen.blit(run_images[i], run_images[i].get_rect(center=(ix, iy)))
-        pygame.display.flip()
-        pygame.time.delay(50)
+    def draw(anim):
+        # Determine which run images to use based on direction
+        img = cat_sprites("run", 6, cat_facing_left)[anim.frame]
+        ix = sx + (ex - sx) * anim.progress
+        iy = sy + (ey - sy) * anim.progress
+        screen.blit(img, img.get_rect(center=(ix, iy)))
 
+    return Animation([50] * len(cat_sprites("run", 6)), draw, begin, on_finish,
+                     rect=cell_rect(start).union(cell_rect(end)))
 
 
 # Draws the game board, including the cat, bait, and blocked tiles
 def draw_board(draw_cat=True):
-    global cat_idle_index, last_idle_update, cat_dead_animation_done, dead_final_sprite
-    screen.blit(grass_bg, (0, 0))
+    board_layer.sync(state.blocked)
+    board_layer.draw(screen)
     draw_hud()
     now = pygame.time.get_ticks()
-    
-
-    for row in range(GRID_SIZE):
-        for col in range(GRID_SIZE):
-            pos = get_cell_center((row, col))
-            color = BLOCKED_COLOR if (row, col) in blocked else TILE_COLOR
-            draw_circle_with_shadow(color, pos, CELL_RADIUS)
 
     # Draw the bait if it exists
-    if bait and mouse_idle_images:
-        pos = get_cell_center(bait)
-        frame = (now // 300) % len(mouse_idle_images)
-        screen.blit(mouse_idle_images[frame], mouse_idle_images[frame].get_rect(center=pos))
+    mouse_images = mouse_sprites() if state.bait else None
+    if mouse_images:
+        pos = get_cell_center(state.bait)
+        frame = (now // 300) % len(mouse_images)
+        screen.blit(mouse_images[frame], mouse_images[frame].get_rect(center=pos))
+
+    # Ring the suggested block (S), once the ranking for this position is ready
+    suggestion = current_block_hint()
+    if suggestion:
+        pygame.draw.circle(screen, BLOCK_HINT_COLOR, get_cell_center(suggestion), CELL_RADIUS, 5)
 
     if draw_cat:
-        cat_center = get_cell_center(cat_pos)
+        cat_center = get_cell_center(state.cat_pos)
         # Draw the cat based on its state
-        if winner == 'player' and dead_images:
-            if not cat_dead_animation_done:
-                if cat_dead_sound:
-                    cat_dead_sound.play()
-                animate_sprite(dead_images, cat_center)
-                dead_final_sprite = dead_images[-1]
-                cat_dead_animation_done = True
+        idle_images = cat_sprites("idle", 4, cat_facing_left)
+        if state.winner == 'player' and cat_sprites("dead", 4):
             if dead_final_sprite:
                 screen.blit(dead_final_sprite, dead_final_sprite.get_rect(center=cat_center))
-        elif not game_over and idle_images_original:
-            if now - last_idle_update > 300:
-                cat_idle_index = (cat_idle_index + 1) % len(idle_images_original)
-                last_idle_update = now
-            images = idle_images_flipped if cat_facing_left else idle_images_original
-            screen.blit(images[cat_idle_index], images[cat_idle_index].get_rect(center=cat_center))
-        elif not game_over:
-            draw_circle_with_shadow((255, 165, 0), cat_center, CELL_RADIUS - 5)
+        elif not state.game_over and idle_images:
+            screen.blit(idle_images[cat_idle_index], idle_images[cat_idle_index].get_rect(center=cat_center))
+        elif not state.game_over:
+            draw_circle_with_shadow((255, 165, 0), cat_center, CELL_RADIUS - CELL_RADIUS // 6)
+
+
+# Draws the average time spent drawing a frame in the bottom-left corner
+def draw_frame_time():
+    text = text_cache.render(f"{shown_frame_ms:.1f} ms", (255, 255, 255))
+    screen.blit(text, (10, HEIGHT - text.get_height() - 5))
+    if first_frame_ms is not None:
+        startup = debug_text_cache.render(f"First frame after {first_frame_ms:.0f} ms ({assets.summary()})",
+                                          (255, 255, 255))
+        screen.blit(startup, (10, HEIGHT - text.get_height() - startup.get_height() - 5))
+
+
+# Draws the TurnStats of the cat's last turn (F4)
+def draw_ai_stats():
+    screen.blit(ai_stats_panel, AI_STATS_RECT)
+    stats = state.last_stats
+    lines = stats.lines() if stats else ["No stats yet"]
+    y = AI_STATS_RECT.top + 6
+    for line in lines:
+        text = debug_text_cache.render(line, (255, 255, 255))
+        screen.blit(text, (AI_STATS_RECT.left + 8, y))
+        y += text.get_height() + 2
+
+
+# The minimum cut between the cat and the edge (trap_cut.py), recomputed only when the position changed
+def current_trap_cut():
+    global trap_hint
+    cat = state.grid.index(state.cat_pos)
+    key = (cat, state.blocked.hash)
+    if trap_hint is None or trap_hint[0] != key:
+        trap_hint = (key, min_cut(cat, state.blocked))
+    return trap_hint[1]
+
+
+# Rings the tiles of the smallest wall that traps the cat and says how many moves it takes at least (H)
+def draw_trap_hint():
+    cut = current_trap_cut()
+    for i in cut.cells:
+        pygame.draw.circle(screen, TRAP_HINT_COLOR, get_cell_center(state.grid.cell(i)), CELL_RADIUS, 3)
+
+    if cut.size == 0:
+        label = "Cat is walled in"
+    elif cut.size == 1 and state.cat_has_attacked_in_game:
+        label = "Trap in 1 move"
+    else:
+        label = f"Trap in {cut.size}+ moves" # A lower bound: the cat keeps running (and may attack)
+    screen.blit(trap_hint_panel, TRAP_HINT_RECT)
+    text = debug_text_cache.render(label, (255, 255, 255))
+    screen.blit(text, text.get_rect(center=TRAP_HINT_RECT.center))
+
+def trap_hint_rect():
+    cut = current_trap_cut()
+    return TRAP_HINT_RECT.unionall([cell_rect(state.grid.cell(i)) for i in cut.cells])
+
+
+# The suggested block as (row, col) if it is shown and still fits the position, else None
+def current_block_hint():
+    if not show_block_hint or not player_turn or state.game_over:
+        return None
+    if block_hint is None or block_hint.key != hint.position_key(state):
+        return None
+    return block_hint.best
+
+
+# Advances the cat's idle animation every 300 ms
+def advance_idle_animation(now):
+    global cat_idle_index, last_idle_update
+    idle_images = cat_sprites("idle", 4)
+    if idle_images and now - last_idle_update > 300:
+        cat_idle_index = (cat_idle_index + 1) % len(idle_images)
+        last_idle_update = now
+
+
+# Takes the current average frame time for the F3 overlay every 250 ms
+def refresh_frame_time(now):
+    global shown_frame_ms, last_frame_time_update
+    if now - last_frame_time_update > 250:
+        shown_frame_ms = frame_timer.average_ms
+        last_frame_time_update = now
+
+
+# Describes everything that can change between frames as name -> (screen rect, token).
+# DirtyTracker compares it with the previous frame to find what needs repainting.
+def frame_items(now):
+    advance_idle_animation(now)
+    items = {"hud": (HUD_RECT, (state.bait_used, state.cat_has_attacked_in_game, thinking_dots()))}
+
+    mouse_images = mouse_sprites() if state.bait else None
+    if mouse_images:
+        frame = (now // 300) % len(mouse_images)
+        rect = mouse_images[frame].get_rect(center=get_cell_center(state.bait))
+        items["bait"] = (rect, (state.bait, frame))
+
+    cat_token = (state.winner, cat_idle_index, cat_facing_left, cat_dead_animation_done, animations.hides_cat)
+    items["cat"] = (cell_rect(state.cat_pos), cat_token)
+
+    current = animations.current
+    if current is not None:
+        items["animation"] = (current.rect, (id(current), current.elapsed))
+
+    if state.game_over and not animations.busy:
+        hover = restart_button_rect().collidepoint(pygame.mouse.get_pos())
+        items["game_over"] = (screen.get_rect(), (state.winner, hover))
+    if show_frame_time:
+        refresh_frame_time(now)
+        items["frame_time"] = (FRAME_TIME_RECT, (f"{shown_frame_ms:.1f}", first_frame_ms))
+    if show_ai_stats:
+        items["ai_stats"] = (AI_STATS_RECT, id(state.last_stats))
+    if show_trap_hint and not state.game_over:
+        items["trap_hint"] = (trap_hint_rect(), (trap_hint[0], state.cat_has_attacked_in_game))
+    suggestion = current_block_hint()
+    if suggestion:
+        items["block_hint"] = (cell_rect(suggestion), suggestion)
+    return items
 
 
 # --- Game Over Sounds ---
 def handle_game_over_sounds():
-    if background_music_sound:
-        background_music_sound.stop()
+    music = sound("background_music.wav")
+    if music:
+        music.stop()
 
-    if winner == 'cat' and defeat_sound:
-        defeat_sound.play()
-    elif winner == 'player' and victory_sound:
-        victory_sound.play()
+    if state.winner == 'cat':
+        play_sound("defeat.wav")
+    elif state.winner == 'player':
+        play_sound("victory.wav")
 
 
 # --- Game Over Screen ---
+def restart_button_rect():
+    button_rect = pygame.Rect(0, 0, 180, 60)
+    button_rect.center = (WIDTH // 2, HEIGHT // 2 + 130)
+    return button_rect
+
 def draw_game_over():
-    overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-    overlay.fill((0, 0, 0, 150))
-    screen.blit(overlay, (0, 0))
+    screen.blit(game_over_overlay, (0, 0))
     
     # Draw the game over logo
-    if winner == 'cat' and cat_laugh_image:
-        image_rect = cat_laugh_image.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 100))
-        screen.blit(cat_laugh_image, image_rect)
-    elif winner == 'player' and cat_sad_image:
-        image_rect = cat_sad_image.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 100))
-        screen.blit(cat_sad_image, image_rect)
+    image = game_over_image("cat_win.png" if state.winner == 'cat' else "cat_lose.png")
+    if image:
+        screen.blit(image, image.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 100)))
 
     # Draw the winner message
-    msg = "Cat Escaped!" if winner == 'cat' else "You Trapped The Cat!"
-    text = font.render(msg, True, (255, 255, 255))
+    msg = "Cat Escaped!" if state.winner == 'cat' else "You Trapped The Cat!"
+    text = text_cache.render(msg, (255, 255, 255))
     text_rect = text.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 60))
     screen.blit(text, text_rect)
 
     # Draw the restart button
-    button_rect = pygame.Rect(0, 0, 180, 60)
-    button_rect.center = (WIDTH // 2, HEIGHT // 2 + 130)
+    button_rect = restart_button_rect()
     mouse_pos = pygame.mouse.get_pos()
     hover = button_rect.collidepoint(mouse_pos)
 
@@ -398,294 +428,232 @@ def draw_game_over():
     pygame.draw.rect(screen, color, button_rect, border_radius=10)
     pygame.draw.rect(screen, (255, 255, 255), button_rect, 2, border_radius=10)
 
-    restart_text = font.render("Restart", True, TEXT_COLOR)
+    restart_text = text_cache.render("Restart", TEXT_COLOR)
     screen.blit(restart_text, restart_text.get_rect(center=button_rect.center))
     
     return button_rect
 
-def bait_is_a_trap(cat_pos, bait_pos, blocked_set):
-    """
-    Simulates the path to the bait and checks if it leads to a trap.
-    Returns True if bait appears dangerous (likely to trap the cat), else False.
-    """
-    path_to_bait = a_star_search(cat_pos, blocked_set, goal_pos=bait_pos)
-    if not path_to_bait or len(path_to_bait) < 2:
-        return False  # No path or already on bait – not enough info
-
-    # Simulate the path step by step
-    for step in path_to_bait[1:]:  # Skip current position
-        temp_blocked = blocked_set.copy()
-
-        # Try to simulate a "smart" player blocking the cat's next move
-        escape_path = a_star_search(step, temp_blocked)
-        if not escape_path or len(escape_path) < 2:
-            return True  # Already trapped
-
-        dangerous_step = escape_path[1]
-        temp_blocked.add(dangerous_step)
-
-        # Recheck escape options after hypothetical block
-        escape_after_block = a_star_search(step, temp_blocked)
-        if not escape_after_block:
-            return True  # No way out after bait step
-
-    return False  # Passed all checks – bait seems safe
-
-
-def animate_attack_with_tile_flash(images, cat_pos, attacked_tile):
+# The cat attacking a block: a white flash, the flashing tile, then a red fade-out
+def attack_animation(cat_pos, attacked_tile, on_start=None, on_finish=None):
     cat_center = get_cell_center(cat_pos)
     tile_center = get_cell_center(attacked_tile)
     flash_colors = [(255, 50, 50), TILE_COLOR]  # Red and normal
-
-    # --- Attack animation (cat + flashing tile) ---
-    for i, img in enumerate(images):
-    # --- Flash the screen white for a brief moment ---
-        if i == 0:
-            flash = pygame.Surface((WIDTH, HEIGHT))
-            flash.fill((255, 255, 255))
-            flash.set_alpha(100)
-            screen.blit(flash, (0, 0))
-            pygame.display.flip()
-            pygame.time.delay(30)
-
-        draw_board(draw_cat=False)
-
-        # Flash tile
-        flash_color = flash_colors[i % len(flash_colors)]
-        pygame.draw.circle(screen, flash_color, tile_center, CELL_RADIUS)
-
-        # Draw attacking cat
-        dx = attacked_tile[1] - cat_pos[1]
-        flip = dx < 0
-        img_to_draw = pygame.transform.flip(img, True, False) if flip else img
-        screen.blit(img_to_draw, img_to_draw.get_rect(center=cat_center))
-        pygame.display.flip()
-        pygame.time.delay(100)
-
-    # --- Faster fade-out of tile ---
-    final_img = images[-1]
-    for alpha in [200, 120, 60, 0]:  # Fewer steps
-        draw_board(draw_cat=False)
-
-        # Draw fading red over attacked tile
-        s = pygame.Surface((CELL_RADIUS * 2, CELL_RADIUS * 2), pygame.SRCALPHA)
-        pygame.draw.circle(s, (255, 50, 50, alpha), (CELL_RADIUS, CELL_RADIUS), CELL_RADIUS)
-        screen.blit(s, (tile_center[0] - CELL_RADIUS, tile_center[1] - CELL_RADIUS))
-
-        # Hold final cat image
-        screen.blit(final_img, final_img.get_rect(center=cat_center))
-
-        pygame.display.flip()
-        pygame.time.delay(80)  # Shorter delay per frame
-
-def score_bait_path(cat_pos, bait_pos, blocked_set):
-    """
-    Returns a numeric score evaluating how safe/smart it is to go for the bait.
-    Higher score = better opportunity, negative = risky trap.
-    """
-    path = a_star_search(cat_pos, blocked_set, goal_pos=bait_pos)
-    if not path or len(path) < 2:
-        return -1000  # Unreachable or too close to judge
-
-    total_risk = 0
-    total_escape = 0
-    steps_checked = 0
-
-    for step in path[1:]:
-        temp_blocked = blocked_set.copy()
-        escape_path = a_star_search(step, temp_blocked)
-        if not escape_path or len(escape_path) < 2:
-            total_risk += 1
-            continue
-
-        dangerous_block = escape_path[1]
-        temp_blocked.add(dangerous_block)
-        escape_after = a_star_search(step, temp_blocked)
-        if not escape_after:
-            total_risk += 1
-        else:
-            total_escape += 1
-
-        steps_checked += 1
-
-    if steps_checked == 0:
-        return -1000  # No real info
-
-    score = (total_escape - total_risk) * 10 - len(path)  # prefer short, safe paths
-    return score
-
-
-
-def cat_turn():
-    global cat_pos, cat_ignored_bait, winner, game_over, bait, cat_attacked_this_turn, blocked, cat_has_attacked_in_game
-
-    cat_attacked_this_turn = False
-
-    # --- 0. Evaluate bait (trap check + scoring) ---
-    bait_score = None
-    path_to_bait = None
-    future_pos = None
-    if bait and not cat_ignored_bait:
-        # Step 1: Check if bait is a definite trap
-        if bait_is_a_trap(cat_pos, bait, blocked):
-            cat_ignored_bait = True
+    fade_alphas = [200, 120, 60, 0]  # Fewer steps
+    images = cat_sprites("attack", 4, attacked_tile[1] < cat_pos[1])
+
+    def draw(anim):
+        frame = anim.frame
+        if frame == 0:
+            # --- Flash the screen white for a brief moment ---
+            screen.blit(images[0], images[0].get_rect(center=cat_center))
+            screen.blit(screen_flash, (0, 0))
+        elif frame <= len(images):
+            # --- Attack animation (cat + flashing tile) ---
+            flash_color = flash_colors[(frame - 1) % len(flash_colors)]
+            pygame.draw.circle(screen, flash_color, tile_center, CELL_RADIUS)
+            img = images[frame - 1]
+            screen.blit(img, img.get_rect(center=cat_center))
         else:
-            # Step 2: Score the bait opportunity
-            bait_score = score_bait_path(cat_pos, bait, blocked)
-            if bait_score > -1000:
-                path_to_bait = a_star_search(cat_pos, blocked, goal_pos=bait)
-                if path_to_bait and len(path_to_bait) > 1:
-                    future_pos = path_to_bait[1]
-
-    # --- 1. Find best regular move using Minimax ---
-    best_regular_move, best_move_score = find_best_move()
-
-    # --- 2. Check attack option ---
-    best_attack_score = -math.inf
-    block_to_attack = None
-    if not cat_has_attacked_in_game:
-        attackable = [n for n in get_neighbors(cat_pos) if n in blocked]
-        for block in attackable:
-            temp_blocked = blocked.copy()
-            temp_blocked.remove(block)
-            score = evaluate_board(cat_pos, temp_blocked)
-            if score > best_attack_score:
-                best_attack_score = score
-                block_to_attack = block
-
-    # --- 3. Choose the best option ---
-    chosen_move = best_regular_move
-    move_reason = "regular"
-
-    if bait_score is not None and bait_score > best_move_score and future_pos:
-        chosen_move = future_pos
-        move_reason = "bait"
-
-    if block_to_attack and best_attack_score > max(best_move_score, bait_score or -math.inf):
-        # Perform attack first
-        if cat_attack_sound:
-            cat_attack_sound.play()
-        if attack_images:
-            animate_attack_with_tile_flash(attack_images, cat_pos, block_to_attack)
-        blocked.remove(block_to_attack)
-        cat_attacked_this_turn = True
-        cat_has_attacked_in_game = True
-
-        # Recalculate best move after attack
-        best_regular_move, best_move_score = find_best_move()
-        chosen_move = best_regular_move
-        move_reason = "attack_then_move"
-
-    # --- 4. Move to selected tile ---
-    if chosen_move:
-        if jump_sound:
-            jump_sound.play()
-        animate_cat_move(cat_pos, chosen_move)
-        cat_pos = chosen_move
+            # --- Faster fade-out of tile, holding the final cat image ---
+            alpha = fade_alphas[frame - len(images) - 1]
+            s = fade_sprites.get(alpha)
+            if s is None:
+                s = fade_sprites[alpha] = pygame.Surface((CELL_RADIUS * 2, CELL_RADIUS * 2), pygame.SRCALPHA)
+                pygame.draw.circle(s, (255, 50, 50, alpha), (CELL_RADIUS, CELL_RADIUS), CELL_RADIUS)
+            screen.blit(s, (tile_center[0] - CELL_RADIUS, tile_center[1] - CELL_RADIUS))
+            screen.blit(images[-1], images[-1].get_rect(center=cat_center))
+
+    frames = [30] + [100] * len(images) + [80] * len(fade_alphas) if images else []
+    return Animation(frames, draw, on_start, on_finish, rect=screen.get_rect())
+
+
+# Plays the cat's turn: the AI worker decided, this function queues the
+# animations and applies each step of the decision when its animation ends
+def cat_turn(decision):
+    state.cat_attacked_this_turn = False
+    if decision.ignore_bait:
+        state.cat_ignored_bait = True
+
+    # --- Attack first, if the cat chose to break a block ---
+    if decision.attack:
+        animations.play(attack_animation(state.cat_pos, decision.attack, lambda: play_sound("cat_attack.wav"),
+                                         lambda: engine.attack_block(state, decision.attack)))
+
+    # --- Move to selected tile ---
+    if decision.move:
+        def move_end():
+            if engine.move_cat(state, decision.move):
+                play_sound("mouse_dead.wav")
+            if state.game_over:
+                handle_game_over_sounds()
+        animations.play(cat_move_animation(state.cat_pos, decision.move, lambda: play_sound("cat_jump.wav"), move_end))
     else:
-        game_over = True
-        winner = 'player'
-        handle_game_over_sounds()
-        return
+        animations.play(Animation([], on_finish=cat_trapped))
 
-    # --- 5. Handle bait if reached ---
-    if bait and cat_pos == bait:
-        if mouse_dead_sound:
-            mouse_dead_sound.play()
-        bait = None
 
-    # --- 6. Final win condition check ---
-    if is_at_edge(cat_pos):
-        game_over = True
-        winner = 'cat'
-        handle_game_over_sounds()
+# The player won: end the game and play the cat's death animation
+def cat_trapped():
+    engine.trap_cat(state)
+    handle_game_over_sounds()
+    dead_images = cat_sprites("dead", 4)
+    if dead_images:
+        def death_end():
+            global cat_dead_animation_done, dead_final_sprite
+            dead_final_sprite = dead_images[-1]
+            cat_dead_animation_done = True
+        animations.play(sprite_animation(dead_images, state.cat_pos, 150, lambda: play_sound("cat_dead.wav"), death_end))
 
 
 
 # --- Reset Game Function ---
 # Resets the game state to start a new game
 def reset_game():
-    global blocked, cat_ignored_bait, bait, cat_pos, winner, game_over, bait_used, cat_has_attacked_in_game
-    global cat_idle_index, last_idle_update, cat_facing_left, cat_attacked_this_turn
-    global cat_dead_animation_done, dead_final_sprite
-    
-    blocked = set()
-    bait = None
-    cat_pos = (GRID_SIZE // 2, GRID_SIZE // 2)
-    winner = None
-    game_over = False
-    cat_ignored_bait = False
-    bait_used = False
-    cat_has_attacked_in_game = False # Reset the per-game attack flag
-    
+    global cat_idle_index, last_idle_update, cat_facing_left, recorder
+
+    save_recording()
+    recorder = recording.start_game(state, random.getrandbits(63))
+
     cat_idle_index = 0
     last_idle_update = 0
     cat_facing_left = False
-    cat_attacked_this_turn = False
+    reset_cat_death()
+    play_music()
+
+def play_music():
+    music = sound("background_music.wav")
+    if music:
+        music.set_volume(0.8)  # Set volume to 80% 
+        music.play(loops=-1)   # Loop the music indefinitely
+
+# The cat is alive again after a new game or an undo
+def reset_cat_death():
+    global cat_dead_animation_done, dead_final_sprite
     cat_dead_animation_done = False
     dead_final_sprite = None
-    
-    # Randomly place 8 blocked tiles, ensuring they are not on the cat's position
-    while len(blocked) < 8:
-        r = random.randint(0, GRID_SIZE - 1)
-        c = random.randint(0, GRID_SIZE - 1)
-        cell = (r, c)
-        if cell != cat_pos and cell not in blocked:
-            blocked.add(cell)
-    
-    if background_music_sound:
-        background_music_sound.set_volume(0.8)  # Set volume to 80% 
-        background_music_sound.play(loops=-1)   # Loop the music indefinitely
+
+# Saves the game played so far, named after its seed, so it can be replayed with recording.py
+def save_recording():
+    if RECORDINGS_DIR and recorder and recorder.records:
+        os.makedirs(RECORDINGS_DIR, exist_ok=True)
+        recorder.save(os.path.join(RECORDINGS_DIR, f"game-{recorder.state.seed:016x}.ttcr"))
 
 # --- Main Game Loop ---
 def main():
-    global running, player_turn, bait, bait_used, blocked, game_over
+    global running, player_turn, ai_worker, show_frame_time, show_ai_stats, show_trap_hint, first_frame_ms
+    global show_block_hint, block_hint
     running = True
     player_turn = True
+    profiler = Profiler() if PROFILE_AI_PATH else None
+    ai_worker = AIWorker(AI_WORKER_MODE, profiler)
+    cat_turn_started = 0
+    cat_acting = False # The cat's decision is being animated
     reset_game()
 
     while running:
-        draw_board()
-        restart_rect = None
-        if game_over:
-            restart_rect = draw_game_over()
-
-        # Handle animations and updates
-        pygame.display.flip()
-        clock.tick(FPS)
+        # Repaint only what changed since the last frame, or nothing at all
+        tile_rects = board_layer.sync(state.blocked)
+        dirty_rects = dirty.update(frame_items(pygame.time.get_ticks()), tile_rects)
+        if dirty_rects:
+            frame_timer.start()
+            draw_board(draw_cat=not animations.hides_cat)
+            animations.draw()
+            if show_trap_hint and not state.game_over:
+                draw_trap_hint()
+            if state.game_over and not animations.busy:
+                draw_game_over()
+            frame_timer.stop()
+            if show_frame_time:
+                draw_frame_time()
+            if show_ai_stats:
+                draw_ai_stats()
+            pygame.display.update(dirty_rects)
+            if first_frame_ms is None:
+                first_frame_ms = (time.perf_counter() - STARTED_AT) * 1000
+        animations.update(clock.tick(FPS))
+        restart_rect = restart_button_rect() if state.game_over and not animations.busy else None
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
 
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                show_frame_time = not show_frame_time
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                show_ai_stats = engine.COLLECT_STATS = not show_ai_stats
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_h:
+                show_trap_hint = not show_trap_hint
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_s:
+                show_block_hint = not show_block_hint
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
+                animations.skip()
+            # Ctrl+Z takes back the player's last move and the cat's answer, Ctrl+Y plays them again
+            if (event.type == pygame.KEYDOWN and event.key in (pygame.K_z, pygame.K_y)
+                    and event.mod & pygame.KMOD_CTRL and player_turn and not cat_acting):
+                was_over = state.game_over
+                undo = recorder.undo_turn if event.key == pygame.K_z else recorder.redo_turn
+                if undo():
+                    animations.clear()
+                    reset_cat_death()
+                    dirty.invalidate()
+                    if state.game_over and not was_over:
+                        handle_game_over_sounds()
+                    elif was_over and not state.game_over:
+                        play_music()
+
             # Handle mouse clicks for player actions
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                if game_over and restart_rect and restart_rect.collidepoint(event.pos):
+                if state.game_over and restart_rect and restart_rect.collidepoint(event.pos):
+                    ai_worker.cancel()
+                    animations.clear()
                     reset_game()
+                    dirty.invalidate()
                     player_turn = True
+                    cat_acting = False
                     continue
 
                 # Handle player actions only if it's the player's turn and the game is not over
-                if player_turn and not game_over:
+                if player_turn and not state.game_over:
                     cell = get_cell_from_pos(event.pos)
-                    if cell and cell != cat_pos and cell not in blocked and cell != bait:
+                    if engine.can_place(state, cell):
                         mods = pygame.key.get_mods()
-                        if mods & pygame.KMOD_SHIFT and not bait_used:
-                            bait = cell
-                            bait_used = True
-                            if place_mouse_sound: place_mouse_sound.play()
+                        if mods & pygame.KMOD_SHIFT and not state.bait_used:
+                            recorder.place_bait(cell)
+                            play_sound("place_mouse.wav")
                             player_turn = False
                         elif not (mods & pygame.KMOD_SHIFT):
-                            blocked.add(cell)
-                            if place_block_sound: place_block_sound.play()
+                            recorder.place_block(cell)
+                            play_sound("place_block.wav")
                             player_turn = False
 
-        # Handle AI turn if it's not the player's turn and the game is not over
-        if not player_turn and not game_over:
-            pygame.time.delay(100)
-            cat_turn()
-            player_turn = True
-
+        # Handle AI turn: search in the background, then animate the decision
+        if cat_acting:
+            if not animations.busy:
+                cat_acting = False
+                player_turn = True
+        elif not player_turn and not state.game_over:
+            if not ai_worker.busy:
+                ai_worker.submit(state)
+                cat_turn_started = pygame.time.get_ticks()
+            elif pygame.time.get_ticks() - cat_turn_started >= CAT_MOVE_DELAY_MS:
+                result = ai_worker.poll()
+                if result:
+                    decision, state.last_search, state.last_stats = result
+                    recorder.log_cat_turn(decision, state.last_search.depth)
+                    cat_turn(decision)
+                    cat_acting = True
+        elif not state.game_over:
+            # The player is thinking: rank blocks now, so the suggestion (S) is ready when asked for
+            ranked = ai_worker.poll_hint()
+            if ranked:
+                block_hint = ranked
+            if not ai_worker.hint_busy and (block_hint is None or block_hint.key != hint.position_key(state)):
+                ai_worker.submit_hint(state)
+
+    ai_worker.shutdown()
+    save_recording()
+    if profiler:
+        profiler.save(PROFILE_AI_PATH)
+    assets.save_atlas()
     pygame.quit()
     sys.exit()
 
@@ -0,0 +1,143 @@
+"""
+Block suggestions for the player: the "suggest a block" hint in game.py.
+
+A player-side Minimax from scratch would cost as much as the cat's own
+turn. Most of that work has just been done: the cat's last search went
+through the position the player now faces, one ply down, and left its
+values and best moves in the shared transposition table, including the
+block it expected the player to answer with. rank_blocks() scores a
+handful of candidates with the cat's own minimax() on that table, so the
+first iterations are mostly table hits:
+  - the reply the cat's search predicted, read from the table
+  - block_candidates(): the cat's next steps out and the chokepoints of
+    its ways out, from the edge-distance field
+  - the tiles of the smallest wall around the cat (trap_cut.py)
+  - with the bait out, the cat's first step towards it, from the
+    memoized bait analysis
+  - the tiles next to the cat, which are all that is left to block
+    once it is walled in
+Each block is scored by the value the cat gets after it, lowest (best for
+the player) first, deepening until the time budget runs out.
+
+game.py ranks the position in the background as soon as it is the
+player's turn, so pressing the key only has to draw the result.
+"""
+import math
+import time
+
+import engine
+from block_candidates import block_candidates
+from distance_field import EdgeDistanceField
+from trap_cut import min_cut
+
+HINT_TIME_BUDGET_MS = 100 # Time spent ranking blocks per position; the first depth always finishes
+HINT_MAX_DEPTH = 8        # Deepest iteration tried within the budget
+HINT_CANDIDATES = 10      # Blocks from block_candidates() ranked on top of the predicted reply and the wall
+
+
+class BlockHint:
+    """Blocks ranked for one position, best first."""
+
+    def __init__(self, key, ranking, depth):
+        self.key = key         # position_key() of the position ranked
+        self.ranking = ranking # [(cat's value after the block, (row, col))], best for the player first
+        self.depth = depth     # Deepest search that finished for every block
+
+    @property
+    def best(self):
+        """The suggested block as (row, col), or None if there is nothing to block."""
+        return self.ranking[0][1] if self.ranking else None
+
+    def __repr__(self):
+        return f"BlockHint(best={self.best}, depth={self.depth}, blocks={len(self.ranking)})"
+
+
+def position_key(state):
+    """Everything the ranking depends on: a hint is still good while this is unchanged."""
+    return (state.cat_pos, state.blocked.hash, state.bait, state.cat_ignored_bait, state.cat_has_attacked_in_game)
+
+
+def candidate_blocks(state, field, cat, can_attack):
+    """Cell indices worth ranking, in order: predicted reply, paths out, the wall, the bait path, the cat's neighbours."""
+    grid = state.grid
+    candidates = []
+
+    # The cat's last search stored the player's best reply to this position (player to move)
+    zobrist = grid.zobrist
+    key = field.board.hash ^ zobrist.cat[cat]
+    if can_attack:
+        key ^= zobrist.attack_available
+    predicted = state.transpositions.best_move(key)
+    if predicted is not None:
+        candidates.append(predicted)
+
+    candidates += block_candidates(cat, field, HINT_CANDIDATES, engine.PLAYER_LOOKAHEAD, can_attack)
+    candidates += min_cut(cat, field.board, dist=field.dist).cells
+
+    if state.bait and not state.cat_ignored_bait:
+        bait = engine.analyze_bait(cat, grid.index(state.bait), state.blocked)
+        if not bait.is_trap and bait.next_step is not None:
+            candidates.append(bait.next_step)
+
+    # Walled in already: what is left is taking the cat's last moves away
+    candidates += grid.neighbors[cat]
+
+    seen = set()
+    blocks = []
+    for i in candidates:
+        if i not in seen and engine.can_place(state, grid.cell(i)):
+            seen.add(i)
+            blocks.append(i)
+    return blocks
+
+
+def rank_blocks(state, budget_ms=HINT_TIME_BUDGET_MS, max_depth=HINT_MAX_DEPTH):
+    """
+    BlockHint for the player to move in state. Uses (and fills) the
+    state's transposition table, like the cat's own search. With
+    budget_ms None it searches to exactly max_depth, the same way every time.
+    """
+    start = time.perf_counter()
+    grid = state.grid
+    cat = grid.index(state.cat_pos)
+    key = position_key(state)
+    if state.game_over:
+        return BlockHint(key, [], 0)
+
+    field = EdgeDistanceField(state.blocked.copy())
+    can_attack = not state.cat_has_attacked_in_game
+    blocks = candidate_blocks(state, field, cat, can_attack)
+    search = engine.SearchContext(state.transpositions)
+
+    ranking = []
+    depth = 0
+    for next_depth in range(1, max_depth + 1):
+        scores = {}
+        best = math.inf
+        try:
+            for block in blocks:
+                field.block(block)
+                try:
+                    if best == math.inf:
+                        score = engine.minimax(next_depth, True, cat, field, -math.inf, math.inf, search, can_attack)
+                    else:
+                        # Only a block the cat does worse against matters: prove the others are no better first
+                        score = engine.minimax(next_depth, True, cat, field, best - 1, best, search, can_attack)
+                        if score < best:
+                            score = engine.minimax(next_depth, True, cat, field, -math.inf, best, search, can_attack)
+                finally:
+                    field.undo()
+                scores[block] = score
+                best = min(best, score)
+        except engine.SearchTimeout:
+            break
+        # Stable: equal blocks keep the candidate order, the predicted reply first
+        blocks.sort(key=scores.__getitem__)
+        ranking = [(scores[block], grid.cell(block)) for block in blocks]
+        depth = next_depth
+        if not ranking or ranking[0][0] in (1000, -1000):
+            break # The cat is trapped, or escapes whatever is blocked: deeper searches agree
+        # The first depth always finishes so there is a suggestion
+        if budget_ms is not None:
+            search.deadline = start + budget_ms / 1000
+    return BlockHint(key, ranking, depth)
@@ -0,0 +1,110 @@
+"""
+Where the cat's thinking time goes.
+
+TurnStats collects what one plan_cat_turn() did: wall time per phase
+(bait analysis, then Minimax, which also weighs the cat's attack) and
+counters for Minimax nodes, alpha-beta cutoffs, transposition table
+hits, A* calls and A* heap pushes. It is only created when engine.COLLECT_STATS is on; with it
+off, the phases run without timers and the search hot path is unchanged.
+
+Profiler sums cProfile over many calls, e.g. every cat turn of a game,
+into one pstats report.
+"""
+from contextlib import contextmanager, nullcontext
+import cProfile
+import io
+import pstats
+import time
+
+NO_PHASE = nullcontext() # Stands in for TurnStats.phase() when stats are off
+
+
+class TurnStats:
+    """Counters and phase timings of one cat turn."""
+
+    def __init__(self):
+        self.nodes = 0
+        self.cutoffs = 0
+        self.tt_hits = 0
+        self.tt_misses = 0
+        self.astar_calls = 0
+        self.heap_pushes = 0
+        self.depth = 0       # Deepest completed Minimax iteration
+        self.phases = {}     # Phase name -> ms, in the order they ran
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+    @property
+    def total_ms(self):
+        return sum(self.phases.values())
+
+    def add_search(self, info):
+        """Adds the counters of a finished find_best_move() (its SearchInfo)."""
+        self.nodes += info.nodes
+        self.cutoffs += info.cutoffs
+        self.tt_hits += info.tt_hits
+        self.tt_misses += info.tt_misses
+        self.depth = max(self.depth, info.depth)
+
+    def add(self, other):
+        """Adds another TurnStats, e.g. to total up a whole game."""
+        for name in ("nodes", "cutoffs", "tt_hits", "tt_misses", "astar_calls", "heap_pushes"):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        self.depth = max(self.depth, other.depth)
+        for name, ms in other.phases.items():
+            self.phases[name] = self.phases.get(name, 0.0) + ms
+
+    def add_astar(self, pushes):
+        self.astar_calls += 1
+        self.heap_pushes += pushes
+
+    def as_dict(self):
+        data = {name: getattr(self, name) for name in
+                ("nodes", "cutoffs", "tt_hits", "tt_misses", "astar_calls", "heap_pushes", "depth")}
+        data["phases_ms"] = {name: round(ms, 3) for name, ms in self.phases.items()}
+        return data
+
+    def lines(self):
+        """Short text lines for the debug overlay."""
+        probes = self.tt_hits + self.tt_misses
+        lines = [
+            f"turn {self.total_ms:.1f} ms  depth {self.depth}",
+            f"nodes {self.nodes:,}  cutoffs {self.cutoffs:,}",
+            f"tt hits {self.tt_hits:,} ({self.tt_hits / probes if probes else 0.0:.0%})",
+            f"A* {self.astar_calls} calls  {self.heap_pushes:,} pushes",
+        ]
+        lines += [f"{name} {ms:.1f} ms" for name, ms in self.phases.items()]
+        return lines
+
+    def __repr__(self):
+        return f"TurnStats({self.as_dict()})"
+
+
+def phase(stats, name):
+    """stats.phase(name), or a no-op context when stats is None."""
+    return stats.phase(name) if stats is not None else NO_PHASE
+
+
+class Profiler:
+    """One cProfile.Profile that runcall() adds to, for a report over a whole game."""
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+
+    def runcall(self, func, *args, **kwargs):
+        return self.profile.runcall(func, *args, **kwargs)
+
+    def save(self, path):
+        """Writes the pstats file (open with python -m pstats or snakeviz)."""
+        self.profile.dump_stats(path)
+
+    def report(self, limit=25, sort="cumulative"):
+        stream = io.StringIO()
+        pstats.Stats(self.profile, stream=stream).sort_stats(sort).print_stats(limit)
+        return stream.getvalue()
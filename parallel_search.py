@@ -0,0 +1,103 @@
+"""
+Parallel root search for find_best_move().
+
+Root options (moves, and attack-then-move while the cat has its attack)
+are independent, so after the first ("eldest brother") one has been
+searched locally with a full window, the others are searched at the same
+time in a process pool. They share the eldest's score as the lower bound
+of their window (Young Brothers Wait). The window starts one point below
+that score, so every option that ties or beats it still gets an exact
+value, and the set of best options is the same as the serial search's.
+
+Enabled by setting engine.PARALLEL_ROOT_WORKERS to the number of processes.
+"""
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import engine
+from distance_field import EdgeDistanceField
+from transposition import TranspositionTable
+
+pool = None
+pool_workers = 0
+pool_settings = None # ENGINE_SETTINGS values the pool's workers were started with
+
+# Each worker process keeps its own transposition table between tasks
+worker_table = None
+
+
+def init_worker(settings):
+    global worker_table
+    for name, value in settings.items():
+        setattr(engine, name, value)
+    worker_table = TranspositionTable(engine.TRANSPOSITION_TABLE_SIZE)
+
+
+def search_move(board, option, depth, alpha, beta, budget_s, can_attack):
+    """Runs in a worker: scores one root (attack, move) option. Returns (value, nodes), value None on timeout."""
+    field = EdgeDistanceField(board)
+    deadline = time.perf_counter() + budget_s if budget_s is not None else None
+    search = engine.SearchContext(worker_table, deadline)
+    search.can_attack = can_attack
+    try:
+        value = engine.search_option(option, depth, field, alpha, beta, search)
+    except engine.SearchTimeout:
+        return None, search.nodes
+    return value, search.nodes
+
+
+def get_pool():
+    """The shared process pool, (re)created when PARALLEL_ROOT_WORKERS or any of engine.ENGINE_SETTINGS changes."""
+    global pool, pool_workers, pool_settings
+    workers = engine.PARALLEL_ROOT_WORKERS or os.cpu_count() or 1
+    settings = {name: getattr(engine, name) for name in engine.ENGINE_SETTINGS}
+    if pool is None or pool_workers != workers or pool_settings != settings:
+        shutdown()
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(settings,))
+        pool_workers = workers
+        pool_settings = settings
+    return pool
+
+
+def shutdown():
+    global pool
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+        pool = None
+
+
+def parallel_search_root(cat, field, depth, search):
+    """Drop-in replacement for engine.search_root() that fans root options out to the pool."""
+    options = engine.root_options(cat, field.board, search.can_attack)
+    if not options:
+        return engine.best_options({})
+
+    # Eldest brother: searched here with a full window, using the game's own table
+    eldest = options[0]
+    eldest_score = engine.search_option(eldest, depth, field, -math.inf, math.inf, search)
+    scores = {eldest: eldest_score}
+
+    budget_s = None
+    if search.deadline is not None:
+        budget_s = search.deadline - time.perf_counter()
+        if budget_s <= 0:
+            raise engine.SearchTimeout()
+
+    executor = get_pool()
+    futures = [(option, executor.submit(search_move, field.board, option, depth, eldest_score - 1, math.inf,
+                                        budget_s, search.can_attack))
+               for option in options[1:]]
+    timed_out = False
+    for option, future in futures:
+        value, nodes = future.result()
+        search.nodes += nodes
+        if value is None:
+            timed_out = True
+        scores[option] = value
+    if timed_out:
+        raise engine.SearchTimeout()
+
+    # Options that failed low (value <= eldest_score - 1) cannot be among the best
+    return engine.best_options(scores)
@@ -0,0 +1,332 @@
+"""
+Game recording: a compact binary move log, deterministic replay and undo/redo.
+
+A game is its seed plus the actions played on it. The seed fixes
+reset_game()'s random blocks and, through GameState.seed, every tie-break
+of the cat's search (engine.tie_break_rng()). Every action after that is
+one 16-bit record:
+
+  bits 0-1   kind: BLOCK, BAIT or CAT
+  player     bits 2-15: the tile, as a cell index
+  cat        bits 2-4: the move, as a slot in grid.neighbors[cat] (NO_STEP if trapped)
+             bits 5-7: the block it broke first, the same way (NO_STEP if none)
+             bits 8-12: the depth its search finished, bit 13: it ate the bait,
+             bit 14: it decided the bait is a trap
+
+The file is a header (magic, version, topology, size, seed) and the
+records. The depth is what makes a turn reproducible: in the game the
+cat deepens until its time budget runs out, so replay() searches each
+turn to exactly the recorded depth and checks that the cat decides the
+same again, at full speed and without a window.
+
+GameRecorder plays the actions on a GameState and keeps, for each cat
+turn, the little it changed (old position, broken block, eaten bait,
+flags), so undo() and redo() are a few assignments instead of copies of
+the board. Player actions carry their own tile and need nothing more.
+
+Replay a recorded game, or time one of its turns, with:
+    python recording.py GAME.ttcr [--slowest 5] [--turn N --repeat 20]
+"""
+import argparse
+import random
+import statistics
+import struct
+import sys
+import time
+
+import engine
+from board import TOPOLOGIES
+from transposition import TranspositionTable
+
+MAGIC = b"TTCR"
+VERSION = 1
+HEADER = struct.Struct("<4sBBHQ") # magic, version, topology, size, seed
+BLOCK, BAIT, CAT = 0, 1, 2 # Record kinds
+NO_STEP = 7                # Neighbour slot meaning "none"
+MAX_DEPTH = 31             # Deepest search a record can hold
+
+
+# --- Records ---
+def pack_player(kind, i):
+    return kind | i << 2
+
+def pack_cat(state, decision, depth):
+    """The record of a CatDecision, taken in state before it is applied."""
+    grid = state.grid
+    neighbors = grid.neighbors[grid.index(state.cat_pos)]
+    move = neighbors.index(grid.index(decision.move)) if decision.move else NO_STEP
+    attack = neighbors.index(grid.index(decision.attack)) if decision.attack else NO_STEP
+    ate_bait = state.bait is not None and decision.move == state.bait
+    return (CAT | move << 2 | attack << 5 | min(depth, MAX_DEPTH) << 8
+            | ate_bait << 13 | decision.ignore_bait << 14)
+
+def cat_depth(record):
+    return record >> 8 & 31
+
+def unpack_decision(state, record):
+    """The CatDecision of a cat record, for the cat in state."""
+    grid = state.grid
+    neighbors = grid.neighbors[grid.index(state.cat_pos)]
+    move, attack = record >> 2 & 7, record >> 5 & 7
+    decision = engine.CatDecision(grid.cell(neighbors[move]) if move != NO_STEP else None,
+                                  ignore_bait=bool(record >> 14 & 1))
+    if attack != NO_STEP:
+        decision.attack = grid.cell(neighbors[attack])
+        decision.reason = "attack_then_move"
+    return decision
+
+def describe(state, record):
+    """A record in words, for replay reports."""
+    kind = record & 3
+    if kind != CAT:
+        return f"{'bait' if kind == BAIT else 'block'} {state.grid.cell(record >> 2)}"
+    decision = unpack_decision(state, record)
+    text = f"cat to {decision.move}" if decision.move else "cat trapped"
+    if decision.attack:
+        text += f" breaking {decision.attack}"
+    if record >> 13 & 1:
+        text += ", eats the bait"
+    if decision.ignore_bait:
+        text += ", ignores the bait"
+    return text + f" (depth {cat_depth(record)})"
+
+
+# --- Recording ---
+def start_game(state, seed):
+    """Resets state to the game of this seed and returns its GameRecorder."""
+    engine.reset_game(state, random.Random(seed))
+    state.seed = seed
+    return GameRecorder(state)
+
+
+class GameRecorder:
+    """Plays actions on a GameState and logs them, with undo and redo."""
+
+    def __init__(self, state):
+        self.state = state
+        self.records = [] # Every action so far, oldest first
+        self.deltas = []  # What each cat record changed (None for player records), for undo()
+        self.undone = []  # Records taken back by undo(), the next one to redo last
+
+    # --- Actions ---
+    def place_block(self, cell):
+        self.undone.clear()
+        self.play(pack_player(BLOCK, self.state.grid.index(cell)))
+
+    def place_bait(self, cell):
+        self.undone.clear()
+        self.play(pack_player(BAIT, self.state.grid.index(cell)))
+
+    def cat_turn(self, decision, depth):
+        """Logs the cat's decision and applies it."""
+        self.undone.clear()
+        self.play(pack_cat(self.state, decision, depth))
+
+    def log_cat_turn(self, decision, depth):
+        """Logs the cat's decision without applying it (game.py applies it step by step as it animates)."""
+        self.undone.clear()
+        self.push(pack_cat(self.state, decision, depth))
+
+    def push(self, record):
+        state = self.state
+        delta = None
+        if record & 3 == CAT:
+            eaten = state.bait if record >> 13 & 1 else None
+            attack = unpack_decision(state, record).attack
+            delta = (state.cat_pos, attack, eaten, state.cat_ignored_bait,
+                     state.cat_has_attacked_in_game, state.cat_attacked_this_turn)
+        self.records.append(record)
+        self.deltas.append(delta)
+
+    def play(self, record):
+        """Applies one record to the state and logs it."""
+        state = self.state
+        kind = record & 3
+        decision = unpack_decision(state, record) if kind == CAT else None
+        self.push(record)
+        if kind == CAT:
+            engine.apply_cat_turn(state, decision)
+        elif kind == BAIT:
+            engine.place_bait(state, state.grid.cell(record >> 2))
+        else:
+            engine.place_block(state, state.grid.cell(record >> 2))
+
+    # --- Undo / Redo ---
+    def undo(self):
+        """Takes back the last action. Returns its kind, or None if there is nothing to undo."""
+        if not self.records:
+            return None
+        state = self.state
+        record = self.records.pop()
+        delta = self.deltas.pop()
+        self.undone.append(record)
+        kind = record & 3
+        if kind == CAT:
+            (state.cat_pos, attack, eaten, state.cat_ignored_bait,
+             state.cat_has_attacked_in_game, state.cat_attacked_this_turn) = delta
+            if attack:
+                state.blocked.add(attack)
+            if eaten:
+                state.bait = eaten
+            state.game_over = False # Only a cat turn ends the game
+            state.winner = None
+        else:
+            if kind == BAIT:
+                state.bait = None
+                state.bait_used = False
+            else:
+                state.blocked.remove(state.grid.cell(record >> 2))
+            state.turn -= 1
+        return kind
+
+    def redo(self):
+        """Plays the last undone action again. Returns its kind, or None if there is nothing to redo."""
+        if not self.undone:
+            return None
+        record = self.undone.pop()
+        self.play(record)
+        return record & 3
+
+    def undo_turn(self):
+        """Takes back the player's last action and the cat's answer to it. Returns False if there was none."""
+        kind = self.undo()
+        while kind == CAT:
+            kind = self.undo()
+        return kind is not None
+
+    def redo_turn(self):
+        """Plays the next undone player action again, and the cat's answer if it was recorded."""
+        if self.redo() is None:
+            return False
+        if self.undone and self.undone[-1] & 3 == CAT:
+            self.redo()
+        return True
+
+    # --- Files ---
+    def to_bytes(self):
+        grid = self.state.grid
+        header = HEADER.pack(MAGIC, VERSION, TOPOLOGIES.index(grid.topology), grid.size, self.state.seed)
+        return header + struct.pack(f"<{len(self.records)}H", *self.records)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+
+def read(data):
+    """(seed, size, topology, records) of a recording's bytes."""
+    magic, version, topology, size, seed = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Not a version {VERSION} game recording")
+    count = (len(data) - HEADER.size) // 2
+    records = list(struct.unpack_from(f"<{count}H", data, HEADER.size))
+    return seed, size, TOPOLOGIES[topology], records
+
+def load(path):
+    with open(path, "rb") as f:
+        return read(f.read())
+
+
+# --- Replay ---
+class ReplayedTurn:
+    """One cat turn searched again by replay()."""
+
+    def __init__(self, index, turn, record, replayed, ms, nodes):
+        self.index = index       # Position of the record in the game
+        self.turn = turn         # Player actions before it (GameState.turn)
+        self.record = record     # As recorded
+        self.replayed = replayed # As decided again
+        self.ms = ms
+        self.nodes = nodes
+
+    @property
+    def matches(self):
+        return self.record == self.replayed
+
+
+def plan_at_depth(state, depth):
+    """plan_cat_turn() searching to exactly depth, the way the recorded turn ended."""
+    saved = engine.MINIMAX_DEPTH, engine.SEARCH_TIME_BUDGET_MS
+    engine.MINIMAX_DEPTH, engine.SEARCH_TIME_BUDGET_MS = depth, None
+    try:
+        return engine.plan_cat_turn(state)
+    finally:
+        engine.MINIMAX_DEPTH, engine.SEARCH_TIME_BUDGET_MS = saved
+
+
+def replay(seed, size, topology, records, verify=True, until=None):
+    """
+    Plays a recorded game headless. With verify, every cat turn is
+    planned again at its recorded depth and compared with the record; the
+    game always goes on with the recorded action. Stops before record
+    index until, if given. Returns (GameRecorder, [ReplayedTurn]).
+    """
+    recorder = start_game(engine.GameState(size, topology), seed)
+    state = recorder.state
+    turns = []
+    for index, record in enumerate(records[:until]):
+        if verify and record & 3 == CAT:
+            start = time.perf_counter()
+            decision = plan_at_depth(state, cat_depth(record))
+            ms = (time.perf_counter() - start) * 1000
+            replayed = pack_cat(state, decision, state.last_search.depth)
+            turns.append(ReplayedTurn(index, state.turn, record, replayed, ms, state.last_search.nodes))
+        recorder.play(record)
+    return recorder, turns
+
+
+def time_turn(seed, size, topology, records, turn, repeat):
+    """Replays up to the cat's answer to player action turn and plans it repeat times, each with an empty table."""
+    index = next((i for i, record in enumerate(records) if record & 3 == CAT
+                  and sum(1 for r in records[:i] if r & 3 != CAT) == turn), None)
+    if index is None:
+        raise ValueError(f"No cat turn after player action {turn}")
+    recorder, _ = replay(seed, size, topology, records, verify=False, until=index)
+    times = []
+    for _ in range(repeat):
+        state = recorder.state.copy()
+        state.transpositions = TranspositionTable(engine.TRANSPOSITION_TABLE_SIZE)
+        start = time.perf_counter()
+        plan_at_depth(state, cat_depth(records[index]))
+        times.append((time.perf_counter() - start) * 1000)
+    return recorder.state, records[index], times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("path", help="a .ttcr file saved by game.py")
+    parser.add_argument("--slowest", type=int, default=5, help="cat turns to list by search time")
+    parser.add_argument("--turn", type=int, help="time only the cat's answer to this player action (1 = first)")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    seed, size, topology, records = load(args.path)
+    print(f"{size}x{size} {topology}, seed {seed}, {len(records)} actions")
+
+    if args.turn is not None:
+        state, record, times = time_turn(seed, size, topology, records, args.turn, args.repeat)
+        print(f"turn {args.turn}: {describe(state, record)}")
+        print(f"  {args.repeat} runs: min {min(times):.2f} ms  median {statistics.median(times):.2f} ms  "
+              f"max {max(times):.2f} ms")
+        return
+
+    start = time.perf_counter()
+    recorder, turns = replay(seed, size, topology, records)
+    elapsed = time.perf_counter() - start
+    state = recorder.state
+    print(f"replayed in {elapsed * 1000:.0f} ms, winner {state.winner}")
+
+    mismatches = [t for t in turns if not t.matches]
+    for t in mismatches:
+        before, _ = replay(seed, size, topology, records, verify=False, until=t.index)
+        print(f"  turn {t.turn}: recorded {describe(before.state, t.record)}, "
+              f"replayed {describe(before.state, t.replayed)}")
+    print(f"{len(turns) - len(mismatches)}/{len(turns)} cat turns decided the same")
+    for t in sorted(turns, key=lambda t: -t.ms)[:args.slowest]:
+        print(f"  turn {t.turn:3}  {t.ms:8.2f} ms  {t.nodes:7,} nodes  depth {cat_depth(t.record)}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
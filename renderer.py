@@ -0,0 +1,147 @@
+"""
+Cached drawing helpers for game.py.
+
+The board background (grass plus one circle per tile) only changes when a
+block is added or removed, so it is kept pre-rendered in one surface and
+only the tiles that changed are redrawn. Each frame then starts with a
+single blit, and the HUD, bait and cat are drawn on top. DirtyTracker
+works out which parts of the window actually changed, so only those are
+pushed to the display and frames where nothing changed are skipped.
+"""
+import time
+
+import pygame
+
+SHADOW_OFFSET = (3, 3)
+SHADOW_COLOR = (0, 0, 0, 50)
+TILE_ALPHA = 230
+
+
+# Pre-renders a circle with a soft drop shadow, the look of every tile
+def make_circle_sprite(color, radius, shadow_offset=SHADOW_OFFSET):
+    surf = pygame.Surface((radius * 2 + shadow_offset[0], radius * 2 + shadow_offset[1]), pygame.SRCALPHA)
+    pygame.draw.circle(surf, SHADOW_COLOR, (radius + shadow_offset[0], radius + shadow_offset[1]), radius)
+    pygame.draw.circle(surf, color + (TILE_ALPHA,), (radius, radius), radius)
+    return surf
+
+
+class BoardLayer:
+    """
+    Grass and tiles, pre-rendered. sync() redraws only the tiles whose
+    blocked state differs from what is on the surface and returns their
+    rects; draw() blits the whole layer.
+    """
+
+    def __init__(self, background, centers, radius, open_color, blocked_color):
+        self.background = background
+        self.centers = centers # Pixel center of every cell, by cell index
+        self.radius = radius
+        self.tile_sprites = (make_circle_sprite(open_color, radius), make_circle_sprite(blocked_color, radius))
+        self.surface = background.copy()
+        self.drawn = bytearray(len(centers)) # Blocked state currently on the surface
+        for i in range(len(centers)):
+            self.draw_tile(i)
+
+    def tile_rect(self, i):
+        x, y = self.centers[i]
+        sprite = self.tile_sprites[0]
+        return pygame.Rect(x - self.radius, y - self.radius, sprite.get_width(), sprite.get_height())
+
+    def draw_tile(self, i):
+        rect = self.tile_rect(i)
+        self.surface.blit(self.background, rect, rect) # Grass under the tile first
+        self.surface.blit(self.tile_sprites[self.drawn[i]], rect)
+        return rect
+
+    def sync(self, board):
+        """Brings the layer up to date with a Board. Returns the rects that changed."""
+        changed = []
+        if board.cells != self.drawn:
+            for i, blocked in enumerate(board.cells):
+                if blocked != self.drawn[i]:
+                    self.drawn[i] = blocked
+                    changed.append(self.draw_tile(i))
+        return changed
+
+    def draw(self, screen):
+        screen.blit(self.surface, (0, 0))
+
+
+class DirtyTracker:
+    """
+    Remembers where each moving part of the screen was drawn last frame and
+    what it looked like (a token), and reports the areas that need to be
+    pushed to the display this frame.
+    """
+
+    def __init__(self, screen_rect):
+        self.screen_rect = screen_rect
+        self.items = {}
+        self.full = True
+
+    def invalidate(self):
+        """Forces a full repaint, e.g. after something drew straight to the display."""
+        self.full = True
+
+    def update(self, items, extra_rects=()):
+        """
+        items maps a name to (rect, token) for everything that will be drawn.
+        Returns the rects to update: [] when nothing changed, the whole
+        screen after invalidate().
+        """
+        previous, self.items = self.items, dict(items)
+        if self.full:
+            self.full = False
+            return [self.screen_rect]
+
+        rects = list(extra_rects)
+        for name, (rect, token) in items.items():
+            old = previous.get(name)
+            if old is None:
+                rects.append(rect)
+            elif old[1] != token or old[0] != rect:
+                rects.append(old[0]) # Where it was, to erase it
+                rects.append(rect)
+        for name, (rect, _) in previous.items():
+            if name not in items:
+                rects.append(rect)
+        return rects
+
+
+class TextCache:
+    """Rendered text surfaces, so unchanged HUD labels are not re-rendered every frame."""
+
+    def __init__(self, font, max_entries=256):
+        self.font = font
+        self.max_entries = max_entries
+        self.surfaces = {}
+
+    def render(self, text, color):
+        key = (text, color)
+        surf = self.surfaces.get(key)
+        if surf is None:
+            if len(self.surfaces) >= self.max_entries:
+                self.surfaces.clear() # Changing labels (like timings) would otherwise pile up
+            surf = self.surfaces[key] = self.font.render(text, True, color)
+        return surf
+
+
+class FrameTimer:
+    """Rolling average of how long drawing a frame takes, in milliseconds."""
+
+    def __init__(self, window=60):
+        self.window = window
+        self.samples = []
+        self.started = 0.0
+
+    def start(self):
+        self.started = time.perf_counter()
+
+    def stop(self):
+        self.samples.append((time.perf_counter() - self.started) * 1000)
+        if len(self.samples) > self.window:
+            del self.samples[0]
+
+    @property
+    def average_ms(self):
+        return sum(self.samples) / len(self.samples) if self.samples else 0.0
@@ -0,0 +1,262 @@
+"""
+Self-play simulator: the cat AI against scripted players, in batch.
+
+Plays N headless games through the engine's rules (engine.cat_turn() with
+its bait handling and one-time attack) against one of the player policies
+below, spread over a process pool. Game i is seeded with --seed + i, which
+fixes reset_game()'s random blocks, the player's choices and the cat's
+tie-breaks, so a game can be replayed on its own. Every finished game is
+written as one JSON line and a summary with win rates and per-turn
+latency percentiles is printed at the end. Each worker keeps one
+transposition table for all its games; that never changes a decision,
+only how many nodes a search visits. --stats adds the engine's TurnStats
+counters and phase timings to every game; --profile plays in this process
+under cProfile and saves a pstats file.
+
+Run from the repository root:
+    python simulate.py [--games 1000] [--policy greedy] [--workers 4] [--out games.jsonl]
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import json
+import math
+import os
+import random
+import sys
+import time
+
+import ai_worker
+import engine
+import hint
+from board import TOPOLOGIES
+from distance_field import EdgeDistanceField
+from instrumentation import Profiler, TurnStats
+
+
+# --- Player Policies ---
+# Each takes (state, rng) and returns the tile to block. They only read the state.
+
+def random_policy(state, rng):
+    """Blocks any free tile."""
+    grid = state.grid
+    free = [grid.cell(i) for i, v in enumerate(state.blocked.cells) if not v]
+    return rng.choice([cell for cell in free if engine.can_place(state, cell)])
+
+def greedy_policy(state, rng):
+    """Blocks the next tile on the cat's shortest way out."""
+    grid = state.grid
+    cat = grid.index(state.cat_pos)
+    path = engine.a_star_search(cat, state.blocked)
+    if path and len(path) > 1:
+        cell = grid.cell(path[1])
+        if engine.can_place(state, cell):
+            return cell
+    # Already cut off (or the bait is in the way): close whatever is next to the cat
+    around = [cell for cell in engine.get_neighbors(state.cat_pos, grid) if engine.can_place(state, cell)]
+    return rng.choice(around) if around else random_policy(state, rng)
+
+def minimax_policy(state, rng, depth=2):
+    """
+    Tries every block next to the cat or on its shortest way out and keeps
+    the one the cat's own Minimax scores lowest.
+    """
+    grid = state.grid
+    cat = grid.index(state.cat_pos)
+    field = EdgeDistanceField(state.blocked.copy())
+    search = engine.SearchContext(state.transpositions)
+
+    candidates = set(grid.neighbors[cat])
+    path = engine.a_star_search(cat, state.blocked)
+    if path:
+        candidates.update(path[1:])
+    candidates = [i for i in sorted(candidates) if engine.can_place(state, grid.cell(i))]
+    if not candidates:
+        return random_policy(state, rng)
+
+    best_score = math.inf
+    best = []
+    for block in candidates:
+        field.block(block)
+        score = engine.minimax(depth, True, cat, field, -math.inf, math.inf, search,
+                               not state.cat_has_attacked_in_game)
+        field.undo()
+        if score < best_score:
+            best_score = score
+            best = [block]
+        elif score == best_score:
+            best.append(block)
+    return grid.cell(rng.choice(best))
+
+def hint_policy(state, rng, depth=3):
+    """
+    Plays the block the player's hint suggests (hint.py), ranked on the
+    cat's own transposition table. It searches to a fixed depth instead
+    of the game's time budget, so games stay reproducible.
+    """
+    block = hint.rank_blocks(state, None, depth).best
+    return block if block is not None else random_policy(state, rng)
+
+POLICIES = {
+    "random": random_policy,
+    "greedy": greedy_policy,
+    "minimax": minimax_policy,
+    "hint": hint_policy,
+}
+
+
+# --- One Game ---
+def play_game(job):
+    """Plays one seeded game and returns its result as a dict."""
+    game, seed, policy_name, bait_turn, size, topology = job
+    policy = POLICIES[policy_name]
+    rng = random.Random(seed)
+    random.seed(seed) # The cat picks among equally good moves with the module RNG
+
+    state = engine.reset_game(engine.GameState(size, topology), rng)
+    if ai_worker.process_table is not None:
+        state.transpositions = ai_worker.process_table # One table per worker, shared across games
+
+    turns = 0
+    nodes = 0
+    turn_ms = []
+    game_stats = TurnStats() if engine.COLLECT_STATS else None
+    while not state.game_over:
+        # Player's turn: the bait (once, if asked for) or a block
+        cell = policy(state, rng)
+        if turns + 1 == bait_turn and not state.bait_used:
+            engine.place_bait(state, cell)
+        else:
+            engine.place_block(state, cell)
+
+        # Cat's turn
+        start = time.perf_counter()
+        engine.cat_turn(state)
+        turn_ms.append(round((time.perf_counter() - start) * 1000, 3))
+        nodes += state.last_search.nodes if state.last_search else 0
+        if game_stats is not None:
+            game_stats.add(state.last_stats)
+        turns += 1
+
+    result = {
+        "game": game,
+        "seed": seed,
+        "policy": policy_name,
+        "size": size,
+        "topology": topology,
+        "winner": state.winner,
+        "turns": turns,
+        "nodes": nodes,
+        "cat_attacked": state.cat_has_attacked_in_game,
+        "bait_used": state.bait_used,
+        "turn_ms": turn_ms,
+    }
+    if game_stats is not None:
+        result["stats"] = game_stats.as_dict()
+    return result
+
+
+# --- Statistics ---
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(p / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+def summarize(results, elapsed):
+    games = len(results)
+    wins = {}
+    for result in results:
+        wins[result["winner"]] = wins.get(result["winner"], 0) + 1
+    turn_ms = sorted(ms for result in results for ms in result["turn_ms"])
+    turns = len(turn_ms)
+    nodes = sum(result["nodes"] for result in results)
+
+    lines = [f"{games} games in {elapsed:.1f} s ({games / elapsed * 60:,.0f} games/min)"]
+    for winner in ("cat", "player"):
+        lines.append(f"  {winner:<7} wins {wins.get(winner, 0):7} ({wins.get(winner, 0) / games:6.1%})")
+    lines.append(f"  turns per game {turns / games:.1f}, nodes per turn {nodes / max(turns, 1):,.0f}")
+    lines.append("  cat turn ms    " + "  ".join(
+        f"p{p} {percentile(turn_ms, p):.2f}" for p in (50, 90, 99)
+    ) + f"  max {turn_ms[-1] if turn_ms else 0.0:.2f}")
+
+    phases = {}
+    for result in results:
+        for name, ms in result.get("stats", {}).get("phases_ms", {}).items():
+            phases[name] = phases.get(name, 0.0) + ms
+    if phases:
+        total = sum(phases.values())
+        lines.append("  cat time by phase  " + "  ".join(
+            f"{name} {ms / total:.0%}" for name, ms in phases.items()
+        ))
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="greedy")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--size", type=int, default=engine.GRID_SIZE, help="board size, e.g. 11, 21, 31 or 51")
+    parser.add_argument("--topology", choices=TOPOLOGIES, default=engine.BOARD_TOPOLOGY)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="0 plays in this process")
+    parser.add_argument("--depth", type=int, default=engine.MINIMAX_DEPTH, help="cat search depth")
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="per-turn time budget for the cat (iterative deepening); games are then not reproducible")
+    parser.add_argument("--no-trap-cut", action="store_true", help="turn off the cat's min-cut trap check")
+    parser.add_argument("--no-tablebase", action="store_true", help="always search, even in solved endgames")
+    parser.add_argument("--no-pvs", action="store_true", help="full-window alpha-beta instead of principal variation search")
+    parser.add_argument("--beam-width", type=int, default=engine.PLAYER_BEAM_WIDTH,
+                        help="blocks the cat's search tries for the player per turn")
+    parser.add_argument("--bait-turn", type=int, default=0, help="player turn to place the bait on, 0 = never")
+    parser.add_argument("--out", help="JSONL file for the per-game results")
+    parser.add_argument("--stats", action="store_true", help="collect search counters and phase timings")
+    parser.add_argument("--profile", metavar="PATH", help="play in this process under cProfile, save pstats to PATH")
+    args = parser.parse_args()
+
+    engine.MINIMAX_DEPTH = args.depth
+    engine.SEARCH_TIME_BUDGET_MS = args.budget_ms
+    engine.COLLECT_STATS = args.stats
+    engine.TRAP_CUT_CHECK = not args.no_trap_cut
+    engine.USE_TABLEBASE = not args.no_tablebase
+    engine.PVS = not args.no_pvs
+    engine.PLAYER_BEAM_WIDTH = args.beam_width
+    profiler = Profiler() if args.profile else None
+    if profiler:
+        args.workers = 0 # cProfile only sees this process
+    settings = {name: getattr(engine, name) for name in engine.ENGINE_SETTINGS}
+    jobs = [(game, args.seed + game, args.policy, args.bait_turn, args.size, args.topology) for game in range(args.games)]
+
+    out = open(args.out, "w") if args.out else None
+    results = []
+    start = time.perf_counter()
+    try:
+        if args.workers:
+            executor = ProcessPoolExecutor(args.workers, initializer=ai_worker.init_process, initargs=(settings,))
+            chunksize = max(1, min(64, args.games // (args.workers * 8)))
+            games = executor.map(play_game, jobs, chunksize=chunksize)
+        else:
+            ai_worker.init_process(settings)
+            executor = None
+            games = (profiler.runcall(play_game, job) for job in jobs) if profiler else map(play_game, jobs)
+
+        for result in games:
+            results.append(result)
+            if out:
+                out.write(json.dumps(result) + "\n")
+        if executor:
+            executor.shutdown()
+    finally:
+        if out:
+            out.close()
+
+    if not results:
+        sys.exit("No games played")
+    print(summarize(results, time.perf_counter() - start))
+    if profiler:
+        profiler.save(args.profile)
+        print(profiler.report(limit=15))
+
+
+if __name__ == '__main__':
+    main()
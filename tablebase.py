@@ -0,0 +1,251 @@
+"""
+Endgame tablebase: solved "cat near the edge" positions.
+
+Whether the cat can force its way out within k moves only depends on the
+tiles it could still use on the way: cells x with
+distance(cat, x) + edge_distance(x) <= k. Near the edge that is a handful
+of tiles, so every pattern of blocks on them can be solved exactly
+offline (the player may block any tile each turn; the bait and the
+cat's attack only ever help the cat, so a forced escape without them is
+a forced escape in the game too). The search only sees escapes within
+its horizon; the table knows them up to the depth it was built for.
+
+The file holds one entry per (cat cell, k, pattern) that is a forced
+escape in exactly k moves, 2 <= k <= depth, with the first move to play.
+Entries sit in an open-addressing hash table (linear probing), so a
+lookup is a few struct reads at a computed offset. The file is
+memory-mapped on the first probe, not at import, so startup does not
+pay for it and worker processes share the pages.
+
+Build the table for a board with:
+    python tablebase.py [--size 11] [--topology square] [--depth 3]
+"""
+import argparse
+import mmap
+import os
+import struct
+import sys
+import time
+
+from board import TOPOLOGIES, grid_for
+
+TABLEBASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "tablebase")
+DEFAULT_DEPTH = 3 # Longest forced escape stored; 4 takes minutes and a few GB to build
+
+MAGIC = b"TTCB"
+VERSION = 1
+HEADER = struct.Struct("<4sBBHBBI") # magic, version, topology, size, depth, log2(slots), entries
+SLOT = struct.Struct("<QB")         # key (0 = empty slot), index of the move in grid.neighbors[cat]
+HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+PATTERN_BITS = 48                   # key = cat << 52 | k << 48 | pattern
+
+
+def path_for(size, topology):
+    return os.path.join(TABLEBASE_DIR, f"edge_{size}_{topology}.bin")
+
+
+def escape_cells(grid, cat, k):
+    """Cells the cat could still pass on a way out within k moves, in index order."""
+    edge_distance = grid.edge_distance
+    return tuple(x for x in range(grid.cells)
+                 if x != cat and grid.distance(cat, x) + edge_distance[x] <= k)
+
+
+def make_key(cat, k, pattern):
+    return cat << 52 | k << 48 | pattern
+
+def slot_of(key, bits):
+    return ((key * HASH_MULTIPLIER) & 0xFFFFFFFFFFFFFFFF) >> (64 - bits)
+
+
+# --- Lookup ---
+class Tablebase:
+    """A built table, memory-mapped. probe() answers in constant time."""
+
+    def __init__(self, path, grid):
+        with open(path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, topology, size, depth, bits, entries = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} tablebase")
+        if (size, TOPOLOGIES[topology]) != (grid.size, grid.topology):
+            raise ValueError(f"{path} is for a {size}x{size} {TOPOLOGIES[topology]} board")
+        self.grid = grid
+        self.depth = depth
+        self.bits = bits
+        self.entries = entries
+        self.cells = {} # (cat, k) -> escape_cells(), worked out on first use
+
+    def probe(self, cat, board):
+        """(k, move): the cat escapes in k moves whatever the player does, starting with move. None if not in reach."""
+        grid = self.grid
+        edge_distance = grid.edge_distance
+        d = edge_distance[cat]
+        if d == 0 or d > self.depth:
+            return None
+        cells = board.cells
+        neighbors = grid.neighbors[cat]
+        if d == 1:
+            for move in neighbors:
+                if not cells[move] and not edge_distance[move]:
+                    return 1, move # Read off the board
+
+        data = self.data
+        mask = (1 << self.bits) - 1
+        for k in range(max(d, 2), self.depth + 1):
+            escape = self.cells.get((cat, k))
+            if escape is None:
+                escape = self.cells[(cat, k)] = escape_cells(grid, cat, k)
+            pattern = 0
+            for bit, x in enumerate(escape):
+                if cells[x]:
+                    pattern |= 1 << bit
+            key = make_key(cat, k, pattern)
+            slot = slot_of(key, self.bits)
+            while True:
+                stored, move = SLOT.unpack_from(data, HEADER.size + slot * SLOT.size)
+                if stored == key:
+                    return k, neighbors[move]
+                if not stored:
+                    break
+                slot = (slot + 1) & mask
+        return None
+
+    def close(self):
+        self.data.close()
+
+
+tables = {} # (size, topology) -> Tablebase, or None if there is no file for that board
+
+def tablebase_for(grid):
+    """The Tablebase of the grid's board, loaded on first use, or None."""
+    key = (grid.size, grid.topology)
+    if key not in tables:
+        path = path_for(grid.size, grid.topology)
+        tables[key] = Tablebase(path, grid) if os.path.exists(path) else None
+    return tables[key]
+
+
+# --- Solver ---
+class EscapeSolver:
+    """
+    Forced escapes by exhaustive search with memoization. Positions are
+    (cat, blocked cells as a bit mask over board indices, moves left), with
+    the mask cut down to the cells that still matter so equal
+    sub-positions of different patterns share one entry.
+    """
+
+    def __init__(self, grid, depth):
+        self.grid = grid
+        self.relevant = {(cat, k): sum(1 << x for x in escape_cells(grid, cat, k))
+                         for cat in range(grid.cells) if grid.edge_distance[cat] <= depth
+                         for k in range(1, depth + 1)}
+        self.memo = {}
+
+    def wins(self, cat, blocked, k):
+        """True if the cat, to move, reaches the edge within k moves against any blocks."""
+        blocked &= self.relevant[(cat, k)]
+        key = (cat, blocked, k)
+        result = self.memo.get(key)
+        if result is not None:
+            return result
+
+        grid = self.grid
+        edge_distance = grid.edge_distance
+        moves = [m for m in grid.neighbors[cat] if not blocked >> m & 1 and edge_distance[m] < k]
+        result = any(not edge_distance[m] for m in moves)
+        if not result and k > 1:
+            for move in moves:
+                # Every block the player can make on the cat's remaining ways out must fail
+                free = self.relevant[(move, k - 1)] & ~blocked
+                if free:
+                    result = all(self.wins(move, blocked | 1 << b, k - 1) for b in bits_of(free))
+                else:
+                    result = self.wins(move, blocked, k - 1)
+                if result:
+                    break
+        self.memo[key] = result
+        return result
+
+    def first_move(self, cat, blocked, k):
+        """A move that keeps a forced escape in k moves (which must exist)."""
+        grid = self.grid
+        for i, move in enumerate(grid.neighbors[cat]):
+            if blocked >> move & 1:
+                continue
+            if not grid.edge_distance[move]:
+                return i
+            free = self.relevant[(move, k - 1)] & ~blocked
+            blocks = bits_of(free) if free else [None]
+            if all(self.wins(move, blocked if b is None else blocked | 1 << b, k - 1) for b in blocks):
+                return i
+        raise AssertionError("no winning move")
+
+
+def bits_of(mask):
+    bits = []
+    while mask:
+        low = mask & -mask
+        bits.append(low.bit_length() - 1)
+        mask ^= low
+    return bits
+
+
+def solve(grid, depth):
+    """{key: move index} of every forced escape in exactly k moves, 2 <= k <= depth."""
+    solver = EscapeSolver(grid, depth)
+    entries = {}
+    for cat in range(grid.cells):
+        d = grid.edge_distance[cat]
+        if d == 0 or d > depth:
+            continue
+        for k in range(max(d, 2), depth + 1):
+            escape = escape_cells(grid, cat, k)
+            if len(escape) > PATTERN_BITS:
+                raise ValueError(f"depth {depth} is too deep for the key layout")
+            for pattern in range(1 << len(escape)):
+                blocked = 0
+                for bit, x in enumerate(escape):
+                    if pattern >> bit & 1:
+                        blocked |= 1 << x
+                if solver.wins(cat, blocked, k) and not solver.wins(cat, blocked, k - 1):
+                    entries[make_key(cat, k, pattern)] = solver.first_move(cat, blocked, k)
+    return entries
+
+
+def write(path, grid, depth, entries):
+    bits = max(4, (2 * len(entries)).bit_length()) # At most half full
+    mask = (1 << bits) - 1
+    slots = [None] * (1 << bits)
+    for key, move in entries.items():
+        slot = slot_of(key, bits)
+        while slots[slot] is not None:
+            slot = (slot + 1) & mask
+        slots[slot] = (key, move)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, TOPOLOGIES.index(grid.topology), grid.size, depth, bits, len(entries)))
+        for slot in slots:
+            f.write(SLOT.pack(*slot) if slot else SLOT.pack(0, 0))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=11)
+    parser.add_argument("--topology", choices=TOPOLOGIES, default="square")
+    parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH, help="longest forced escape to store, in cat moves")
+    parser.add_argument("--out", help="output file (default: where the game looks for it)")
+    args = parser.parse_args()
+
+    grid = grid_for(args.size, args.topology)
+    start = time.perf_counter()
+    entries = solve(grid, args.depth)
+    path = args.out or path_for(args.size, args.topology)
+    write(path, grid, args.depth, entries)
+    print(f"{len(entries):,} positions in {time.perf_counter() - start:.1f} s -> {path} "
+          f"({os.path.getsize(path):,} bytes)", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Zobrist hashing and a bounded transposition table for the cat's Minimax.
+
+Blocking A then B leads to the same position as blocking B then A, so the
+search keeps running into positions it has already scored. Each position
+gets a 64-bit Zobrist key (XOR of one random number per blocked tile, one
+for the cat's tile, one for the side to move and one for "the cat can
+still attack") that can be updated with a single XOR when a block is
+added or removed.
+"""
+import random
+
+# Bound types stored with each entry
+EXACT = 0
+LOWER = 1 # Search failed high: real value >= stored value
+UPPER = 2 # Search failed low: real value <= stored value
+
+DEFAULT_TABLE_SIZE = 200_000 # Entries kept before the oldest ones are evicted
+
+
+# --- Zobrist Keys ---
+class ZobristKeys:
+    """Random keys for a board of num_cells cells, indexed by cell number.
+    The seed is fixed so hashes are reproducible."""
+
+    def __init__(self, num_cells, seed=0x7A7C):
+        rng = random.Random(seed)
+        self.blocked = [rng.getrandbits(64) for _ in range(num_cells)]
+        self.cat = [rng.getrandbits(64) for _ in range(num_cells)]
+        self.cat_to_move = rng.getrandbits(64)
+        self.attack_available = rng.getrandbits(64)
+
+
+# --- Transposition Table ---
+class TranspositionTable:
+    """
+    Bounded map from position key to (depth, value, bound, best_move).
+    When full, the oldest entries are evicted first. Hit/miss counters are
+    kept so the benefit can be measured.
+    """
+
+    def __init__(self, max_entries=DEFAULT_TABLE_SIZE):
+        self.max_entries = max_entries
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def probe(self, key, depth, alpha, beta):
+        """
+        Returns a value that can be used instead of searching, or None.
+        Entries only answer probes at the same remaining depth: in this game
+        a deeper search is not a refinement of a shallower one, and reusing it
+        would make the cat pick different moves than the plain search.
+        """
+        entry = self.entries.get(key)
+        if entry is None or entry[0] != depth:
+            self.misses += 1
+            return None
+        _, value, bound, _ = entry
+        if bound == EXACT or (bound == LOWER and value >= beta) or (bound == UPPER and value <= alpha):
+            self.hits += 1
+            return value
+        self.misses += 1
+        return None
+
+    def best_move(self, key):
+        """The best move stored for a position at any depth, used for move ordering."""
+        entry = self.entries.get(key)
+        return entry[3] if entry else None
+
+    def store(self, key, depth, value, alpha, beta, best_move=None):
+        """Stores a search result. alpha/beta are the window the node was searched with."""
+        if value <= alpha:
+            bound = UPPER
+        elif value >= beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+
+        entries = self.entries
+        if key in entries:
+            del entries[key] # Re-insert so it counts as the newest entry
+        elif len(entries) >= self.max_entries:
+            del entries[next(iter(entries))] # Dicts keep insertion order: this is the oldest
+            self.evictions += 1
+        entries[key] = (depth, value, bound, best_move)
+        self.stores += 1
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        probes = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / probes if probes else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+        }
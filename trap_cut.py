@@ -0,0 +1,200 @@
+"""
+Minimum vertex cut between the cat and the board edge.
+
+The player traps the cat by blocking every way out, so the fewest blocks
+that do it are a minimum vertex cut between the cat's cell and the edge
+cells. By Menger's theorem that is also the number of ways out that share
+no cell, which is a max-flow with capacity 1 on every cell (each cell is
+split into an IN and an OUT node). The flow can never exceed the cat's 4
+(or 6) neighbours, so a handful of searches over the board find it.
+
+Blocks are never removed (except by the cat's one attack), and the cells
+the cat walks over are open, so a cut that separates the cat's next cell
+from the edge separates its current one too: the player needs at least
+min_cut(cat).size more blocks to trap the cat, wherever it runs. A cut of
+size 1 on the player's turn is exact: blocking that tile wins.
+"""
+import heapq
+import math
+
+from distance_field import UNREACHABLE
+
+IN, OUT = 0, 1 # Halves of a split cell; state = 2 * cell + half
+
+
+class TrapCut:
+    """Result of min_cut(): how many blocks trap the cat and one set of tiles that does it."""
+
+    def __init__(self, size, cells, capped=False):
+        self.size = size     # Blocks needed; math.inf if the cat is on the edge already
+        self.cells = cells   # Tuple of cell indices closest to the cat that form the cut, () if capped
+        self.capped = capped # True if min_cut() stopped at its limit: size is only a lower bound
+
+    def __repr__(self):
+        return f"TrapCut(size={self.size}, cells={self.cells}, capped={self.capped})"
+
+
+def find_augmenting_path(cat, board, pred, dist=None):
+    """
+    Searches the residual graph from the cat, breadth-first or, given the
+    board's edge distances, always from the state closest to the edge
+    (on an open board that finds a way out after a few cells). pred[v] is
+    the cell whose flow enters v (None for cells without flow). Returns
+    (parent map over states, last state); the last state is the OUT half
+    of an edge cell, or None if no path is left.
+    """
+    grid = board.grid
+    cells = board.cells
+    neighbors = grid.neighbors
+    is_edge = grid.is_edge
+    h = dist if dist is not None else [0] * grid.cells
+    start = 2 * cat + OUT
+    parent = {start: None}
+    queue = [(0, 0, start)] # (h, push order, state)
+    pushes = 0
+    while queue:
+        state = heapq.heappop(queue)[2]
+        v = state >> 1
+        if state & OUT:
+            # Into any open neighbour (cell to cell steps have no capacity limit)
+            for n in neighbors[v]:
+                if cells[n] or n == cat:
+                    continue
+                nxt = 2 * n + IN
+                if nxt not in parent:
+                    parent[nxt] = state
+                    pushes += 1
+                    heapq.heappush(queue, (h[n], pushes, nxt))
+            if v != cat and pred[v] is not None:
+                nxt = 2 * v + IN # Undo the flow through v
+                if nxt not in parent:
+                    parent[nxt] = state
+                    pushes += 1
+                    heapq.heappush(queue, (h[v], pushes, nxt))
+        else:
+            p = pred[v]
+            if p is None:
+                nxt = 2 * v + OUT # Through the free cell
+                if is_edge[v]:
+                    parent[nxt] = state
+                    return parent, nxt
+            elif p != cat:
+                nxt = 2 * p + OUT # Back along the flow that enters v
+            else:
+                continue
+            if nxt not in parent:
+                parent[nxt] = state
+                pushes += 1
+                heapq.heappush(queue, (h[nxt >> 1], pushes, nxt))
+    return parent, None
+
+
+def augment(parent, last, pred):
+    """Pushes one unit of flow along the path that ends in last, updating pred."""
+    path = []
+    while last is not None:
+        path.append(last)
+        last = parent[last]
+    path.reverse()
+    for k in range(1, len(path)):
+        a, b = path[k - 1], path[k]
+        u, v = a >> 1, b >> 1
+        if a & OUT and not b & OUT and u != v:
+            pred[v] = u # New flow from u into v
+        elif not a & OUT and b & OUT and u != v and path[k - 2] == 2 * u + OUT:
+            pred[u] = None # u gave up its flow on both sides
+
+
+def min_cut(cat, board, limit=None, dist=None):
+    """
+    Minimum number of blocks that cut the cat (a cell index) off from the
+    edge of board, as a TrapCut. With a limit the search stops once that
+    many separate ways out are found and returns TrapCut(limit, (), True).
+    dist, the board's edge distances, gives the first way out without a search.
+    """
+    grid = board.grid
+    if grid.is_edge[cat]:
+        return TrapCut(math.inf, ())
+
+    pred = [None] * grid.cells
+    flow = 0
+    if dist is not None:
+        if dist[cat] >= UNREACHABLE:
+            return TrapCut(0, ())
+        # Walk downhill to the edge: a shortest way out is a valid first augmenting path
+        neighbors = grid.neighbors
+        v = cat
+        while dist[v]:
+            step = dist[v] - 1
+            n = next(n for n in neighbors[v] if dist[n] == step)
+            pred[n] = v
+            v = n
+        flow = 1
+        if limit is not None and flow >= limit:
+            return TrapCut(flow, (), True)
+    while True:
+        parent, last = find_augmenting_path(cat, board, pred, dist)
+        if last is None:
+            break
+        flow += 1
+        if limit is not None and flow >= limit:
+            return TrapCut(flow, (), True)
+        augment(parent, last, pred)
+
+    # Saturated cells on the border of what the cat can still reach in the residual graph
+    cut = tuple(sorted(state >> 1 for state in parent
+                       if not state & OUT and state + 1 not in parent))
+    return TrapCut(flow, cut)
+
+
+def two_ways_out(cat, board, dist):
+    """
+    Quick, one-sided check with an edge-distance field (distance_field.py):
+    True if walking downhill from two of the cat's neighbours (none more
+    than one step further out than the cat) reaches the edge on two paths
+    that share no cell. False proves nothing.
+    """
+    if dist[cat] >= UNREACHABLE:
+        return False
+    neighbors = board.grid.neighbors
+    reach = dist[cat] + 1
+    starts = sorted((n for n in neighbors[cat] if dist[n] <= reach), key=dist.__getitem__)
+    if len(starts) < 2:
+        return False
+
+    # Any downhill walk from the closest neighbour is a way out
+    v = starts[0]
+    used = {v}
+    while dist[v]:
+        step = dist[v] - 1
+        for n in neighbors[v]:
+            if dist[n] == step:
+                break
+        v = n
+        used.add(v)
+
+    # Then look for a second one that stays off it
+    for v in starts[1:]:
+        if v in used:
+            continue
+        while dist[v]:
+            step = dist[v] - 1
+            for n in neighbors[v]:
+                if dist[n] == step and n not in used:
+                    break
+            else:
+                break
+            v = n
+        if not dist[v]:
+            return True
+    return False
+
+
+def can_trap_in_one(cat, board, dist=None):
+    """
+    True if one more block traps the cat (or it is trapped already).
+    dist, the board's edge distances, lets most open positions skip the flow.
+    """
+    if dist is not None and two_ways_out(cat, board, dist):
+        return False
+    return min_cut(cat, board, 2, dist).size <= 1